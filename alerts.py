@@ -0,0 +1,180 @@
+"""Proximity alert fan-out for newly inserted wildfire reports"""
+import queue
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+
+from incidents import IncidentClusterer
+from spatial_index import SpatialIndex
+from workers import DaemonWorker
+
+
+class WatchRegistry:
+    """Watched locations indexed by center for bulk radius matching
+
+    ``watches_df`` needs recipient, latitude, longitude and radius_km columns.
+    """
+
+    def __init__(self, watches_df, cell_degrees=0.5):
+        self.recipients = watches_df['recipient'].to_numpy(dtype=object)
+        self.radii = watches_df['radius_km'].to_numpy(dtype=np.float64)
+        self.max_radius_km = float(self.radii.max()) if len(self.radii) else 0.0
+        self._index = SpatialIndex(cell_degrees=cell_degrees)
+        # Index by row position so matches map straight back to the arrays
+        self._index.insert_many(
+            np.arange(len(watches_df)),
+            watches_df['latitude'].to_numpy(dtype=np.float64),
+            watches_df['longitude'].to_numpy(dtype=np.float64),
+        )
+
+    def __len__(self):
+        return len(self.recipients)
+
+    def match(self, latitude, longitude):
+        """{recipient: distance_km} for every watch whose radius covers the point
+
+        A recipient with several matching watches is listed once, at the
+        closest distance.
+        """
+        if not len(self.recipients):
+            return {}
+        positions, distances = self._index.within_radius(latitude, longitude, self.max_radius_km)
+        inside = distances <= self.radii[positions]
+        matches = {}
+        # Results are nearest first, so the first hit per recipient is the closest
+        for recipient, distance in zip(self.recipients[positions[inside]].tolist(), distances[inside].tolist()):
+            matches.setdefault(recipient, distance)
+        return matches
+
+
+class AlertFanout:
+    """Background worker writing per-recipient notifications for new reports
+
+    ``load_watches()`` returns the watches DataFrame and
+    ``write_notifications(rows)`` inserts a batch of (report_id, recipient,
+    message, notification_type, location_description, severity) tuples.
+
+    With ``incident_km`` set, reports are grouped into incidents by
+    ``clusterer`` (a private IncidentClusterer if None) and each recipient is
+    alerted once per incident, plus once more if it escalates to Critical.
+    """
+
+    def __init__(self, load_watches, write_notifications, batch_size=500, watch_refresh_interval=60.0,
+                 incident_km=0.0, incident_hours=0.0, clusterer=None):
+        self._load_watches = load_watches
+        self._write_notifications = write_notifications
+        self.batch_size = batch_size
+        self.watch_refresh_interval = watch_refresh_interval
+        self.incident_seconds = incident_hours * 3600
+        if clusterer is None and incident_km:
+            clusterer = IncidentClusterer(eps_km=incident_km, eps_hours=incident_hours)
+        self._clusterer = clusterer
+        # incident id -> (monotonic time of its last alert, {recipient: severity alerted}), oldest first
+        self._alerted = OrderedDict()
+        self._registry = None
+        self._registry_loaded_at = None
+        self._registry_lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._worker = DaemonWorker(self._run, 'alert-fanout')
+        self._stats_lock = threading.Lock()
+        self._stats = {'reports': 0, 'suppressed': 0, 'notifications': 0, 'errors': 0, 'busy_seconds': 0.0}
+        self.last_error = None
+
+    def submit(self, report):
+        """Queue a report dict (id, latitude, longitude, severity, location_description, optional reported_at) for fan-out"""
+        self._worker.ensure_running()
+        self._queue.put(report)
+
+    def join(self):
+        """Block until every queued report has been fanned out"""
+        self._queue.join()
+
+    def invalidate_watches(self):
+        """Reload watch locations before the next fan-out"""
+        with self._registry_lock:
+            self._registry_loaded_at = None
+
+    def registry(self):
+        with self._registry_lock:
+            now = time.monotonic()
+            if self._registry_loaded_at is None or now - self._registry_loaded_at >= self.watch_refresh_interval:
+                self._registry = WatchRegistry(self._load_watches())
+                self._registry_loaded_at = now
+            return self._registry
+
+    def _incident_id(self, report):
+        reported_at = np.datetime64(report.get('reported_at') or datetime.now(), 's')
+        self._clusterer.add_reports([report['id']], [report['latitude']], [report['longitude']], [reported_at])
+        return int(self._clusterer.incident_ids([report['id']])[0])
+
+    def _unalerted(self, report, matches):
+        """matches minus recipients already alerted for the report's incident at this severity or worse
+
+        Only recipients the incident has reached before are dropped, so a
+        duplicate report that reaches new watch areas still alerts them.
+        """
+        if self._clusterer is None:
+            return matches
+        now = time.monotonic()
+        while self._alerted and now - next(iter(self._alerted.values()))[0] > self.incident_seconds:
+            self._alerted.popitem(last=False)
+
+        incident_id = self._incident_id(report)
+        alerted = self._alerted[incident_id][1] if incident_id in self._alerted else {}
+        escalated = report['severity'] == 'Critical'
+        fresh = {
+            recipient: distance for recipient, distance in matches.items()
+            if recipient not in alerted or (escalated and alerted[recipient] != 'Critical')
+        }
+        if fresh:
+            alerted.update(dict.fromkeys(fresh, report['severity']))
+            self._alerted.pop(incident_id, None)
+            self._alerted[incident_id] = (now, alerted)
+        return fresh
+
+    def fan_out(self, report):
+        """Match one report against all watches and write the notifications; returns rows written"""
+        start = time.perf_counter()
+        matches = self.registry().match(report['latitude'], report['longitude'])
+        recipients = self._unalerted(report, matches)
+        rows = [
+            (
+                report['id'],
+                recipient,
+                f"🔥 {report['severity']} wildfire reported {distance:.1f} km from your watched location: {report['location_description']}",
+                'Alert',
+                report['location_description'],
+                report['severity'],
+            )
+            for recipient, distance in recipients.items()
+        ]
+        for offset in range(0, len(rows), self.batch_size):
+            self._write_notifications(rows[offset:offset + self.batch_size])
+
+        with self._stats_lock:
+            self._stats['reports'] += 1
+            self._stats['suppressed'] += len(matches) - len(recipients)
+            self._stats['notifications'] += len(rows)
+            self._stats['busy_seconds'] += time.perf_counter() - start
+        return len(rows)
+
+    def _run(self):
+        while True:
+            report = self._queue.get()
+            try:
+                self.fan_out(report)
+            except Exception as err:  # keep the worker alive for later reports
+                with self._stats_lock:
+                    self._stats['errors'] += 1
+                self.last_error = err
+            finally:
+                self._queue.task_done()
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['queued'] = self._queue.qsize()
+        return stats
@@ -0,0 +1,269 @@
+"""Columnar copy of wildfire reports for historical statistics
+
+Reports are exported into Parquet files partitioned by month and region
+(``month=2024-07/region=N30_W120/``), so aggregations over years of data
+read only the partitions and columns they need and never touch the
+transactional database. Run the export periodically (e.g. hourly):
+
+    python analytics_store.py --root analytics
+    python analytics_store.py --root analytics --sqlite wildfire_local.db
+"""
+import argparse
+import json
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from storage import PLACEHOLDERS, read_frame
+
+REGION_DEGREES = 10  # Size of the lat/lon tiles used as region partitions
+
+# Analytics columns only; reporter contact details stay in the OLTP database
+EXPORT_SCHEMA = pa.schema([
+    ('id', pa.int64()),
+    ('reported_at', pa.timestamp('s')),
+    ('severity', pa.string()),
+    ('status', pa.string()),
+    ('verified', pa.int8()),
+    ('fire_size', pa.string()),
+    ('latitude', pa.float64()),
+    ('longitude', pa.float64()),
+])
+
+STATE_FILE = '_export_state.json'
+
+
+def region_names(latitudes, longitudes, degrees=REGION_DEGREES):
+    """Name of the lat/lon tile each point falls in, e.g. 'N30_W120'"""
+    lat_band = (np.floor(np.asarray(latitudes, dtype=np.float64) / degrees) * degrees).astype(int)
+    lon_band = (np.floor(np.asarray(longitudes, dtype=np.float64) / degrees) * degrees).astype(int)
+    lat_part = pd.Series(np.where(lat_band >= 0, 'N', 'S')) + pd.Series(np.abs(lat_band)).astype(str).str.zfill(2)
+    lon_part = pd.Series(np.where(lon_band >= 0, 'E', 'W')) + pd.Series(np.abs(lon_band)).astype(str).str.zfill(3)
+    return (lat_part + '_' + lon_part).to_numpy()
+
+
+class ParquetExporter:
+    """Incremental export of wildfire_reports into the partitioned store
+
+    Each run finds the months holding rows changed since the previous run
+    (via ``updated_at``) and rewrites only those month partitions.
+
+    ``updated_at`` is set before commit, so a slow transaction can become
+    visible after a run already moved past its timestamp. Each run therefore
+    looks back ``lag_seconds`` before the previous run's newest
+    ``updated_at``; the months it re-finds are simply rewritten again.
+    """
+
+    def __init__(self, connection, root, dialect='mysql', lag_seconds=30.0):
+        self.connection = connection
+        self.root = Path(root)
+        self.dialect = dialect
+        self.lag_seconds = lag_seconds
+
+    def _load_state(self):
+        path = self.root / STATE_FILE
+        return json.loads(path.read_text()) if path.exists() else {}
+
+    def _save_state(self, state):
+        path = self.root / STATE_FILE
+        temp = path.with_suffix('.tmp')
+        temp.write_text(json.dumps(state))
+        temp.replace(path)
+
+    def changed_months(self, since):
+        """Months ('YYYY-MM') with reports updated at or after lag_seconds before since (all months if None)"""
+        p = PLACEHOLDERS[self.dialect]
+        if since is None:
+            changed = read_frame(self.connection, "SELECT reported_at, updated_at FROM wildfire_reports")
+        else:
+            changed = read_frame(
+                self.connection,
+                f"SELECT reported_at, updated_at FROM wildfire_reports WHERE updated_at >= {p}",
+                ((pd.Timestamp(since) - pd.Timedelta(seconds=self.lag_seconds)).strftime('%Y-%m-%d %H:%M:%S'),)
+            )
+        if changed.empty:
+            return [], None
+        months = pd.to_datetime(changed['reported_at']).dt.strftime('%Y-%m').unique()
+        return sorted(months), pd.to_datetime(changed['updated_at']).max()
+
+    def month_reports(self, month):
+        start = pd.Timestamp(f"{month}-01")
+        p = PLACEHOLDERS[self.dialect]
+        reports = read_frame(self.connection, f"""
+        SELECT id, reported_at, severity, status, verified, fire_size, latitude, longitude
+        FROM wildfire_reports
+        WHERE reported_at >= {p} AND reported_at < {p}
+        """, (
+            start.strftime('%Y-%m-%d %H:%M:%S'),
+            (start + pd.offsets.MonthBegin(1)).strftime('%Y-%m-%d %H:%M:%S'),
+        ))
+        reports['reported_at'] = pd.to_datetime(reports['reported_at'])
+        for column in ('latitude', 'longitude'):
+            reports[column] = reports[column].astype(float)
+        reports['verified'] = reports['verified'].fillna(0).astype('int8')
+        return reports
+
+    def write_month(self, month, reports):
+        """Replace one month partition, swapping directories so readers never see half a month"""
+        final = self.root / f"month={month}"
+        staging = self.root / f".staging-month={month}"
+        shutil.rmtree(staging, ignore_errors=True)
+        if not reports.empty:
+            table = pa.Table.from_pandas(reports, schema=EXPORT_SCHEMA, preserve_index=False)
+            table = table.append_column('region', pa.array(region_names(reports['latitude'], reports['longitude'])))
+            ds.write_dataset(
+                table, staging, format='parquet',
+                partitioning=ds.partitioning(pa.schema([('region', pa.string())]), flavor='hive'),
+                existing_data_behavior='overwrite_or_ignore',
+            )
+        retired = self.root / f".retired-month={month}"
+        shutil.rmtree(retired, ignore_errors=True)
+        if final.exists():
+            final.rename(retired)
+        if staging.exists():
+            staging.rename(final)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    def export(self):
+        """Export every month changed since the last run; returns run counters"""
+        start = time.perf_counter()
+        self.root.mkdir(parents=True, exist_ok=True)
+        state = self._load_state()
+        months, max_updated_at = self.changed_months(state.get('max_updated_at'))
+        rows = 0
+        for month in months:
+            reports = self.month_reports(month)
+            self.write_month(month, reports)
+            rows += len(reports)
+        if max_updated_at is not None:
+            if state.get('max_updated_at'):
+                # The lag window can only re-find older rows, never move the mark back
+                max_updated_at = max(max_updated_at, pd.Timestamp(state['max_updated_at']))
+            state['max_updated_at'] = max_updated_at.strftime('%Y-%m-%d %H:%M:%S')
+            self._save_state(state)
+        return {'months': len(months), 'rows': rows, 'seconds': time.perf_counter() - start}
+
+
+class AnalyticsStore:
+    """Aggregations over the partitioned Parquet export
+
+    Month and region filters prune whole partitions; other filters are
+    pushed down to the Parquet row groups. The dataset listing and the
+    results of recent aggregations are reused until the exporter records a
+    new run, since the files cannot change in between.
+    """
+
+    GROUP_COLUMNS = {'month', 'region', 'severity', 'status', 'verified', 'fire_size'}
+
+    def __init__(self, root, max_cached_results=64):
+        self.root = Path(root)
+        self.max_cached_results = max_cached_results
+        self._dataset = None
+        self._version = None
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _current_version(self):
+        path = self.root / STATE_FILE
+        return path.stat().st_mtime_ns if path.exists() else None
+
+    def dataset(self, reload=False):
+        """pyarrow dataset over the export, or None before the first export"""
+        version = self._current_version()
+        if version is None:
+            return None
+        with self._lock:
+            if reload or version != self._version:
+                self._dataset = ds.dataset(
+                    self.root, format='parquet',
+                    partitioning=ds.partitioning(
+                        pa.schema([('month', pa.string()), ('region', pa.string())]), flavor='hive'
+                    ),
+                )
+                self._version = version
+                self._results.clear()
+            return self._dataset
+
+    def months(self):
+        """Exported months in order"""
+        return sorted(path.name.split('=', 1)[1] for path in self.root.glob('month=*'))
+
+    def counts(self, by, start_month=None, end_month=None, regions=None, severities=None):
+        """Report counts grouped by the ``by`` columns, with optional month range and filters"""
+        by = list(by)
+        unknown = set(by) - self.GROUP_COLUMNS
+        if unknown:
+            raise ValueError(f"Cannot group by {sorted(unknown)}")
+        dataset = self.dataset()
+        if dataset is None:
+            return pd.DataFrame(columns=by + ['reports'])
+        key = (tuple(by), start_month, end_month, tuple(regions or ()), tuple(severities or ()))
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._results[key]
+
+        conditions = []
+        if start_month:
+            conditions.append(ds.field('month') >= start_month)
+        if end_month:
+            conditions.append(ds.field('month') <= end_month)
+        if regions:
+            conditions.append(ds.field('region').isin(list(regions)))
+        if severities:
+            conditions.append(ds.field('severity').isin(list(severities)))
+        condition = None
+        for expression in conditions:
+            condition = expression if condition is None else condition & expression
+
+        try:
+            table = dataset.to_table(columns=by + ['id'], filter=condition)
+        except (OSError, pa.ArrowException):
+            # An export swapped a month partition after the listing was taken
+            table = self.dataset(reload=True).to_table(columns=by + ['id'], filter=condition)
+        counts = table.group_by(by).aggregate([('id', 'count')]).to_pandas()
+        counts = counts.rename(columns={'id_count': 'reports'}).sort_values(by).reset_index(drop=True)
+        with self._lock:
+            self._results[key] = counts
+            while len(self._results) > self.max_cached_results:
+                self._results.popitem(last=False)
+        return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export wildfire reports into partitioned Parquet files")
+    parser.add_argument('--root', default='analytics', help="Directory of the Parquet store")
+    parser.add_argument('--sqlite', metavar='PATH', help="Export from a local SQLite file instead of MySQL")
+    parser.add_argument('--lag-seconds', type=float, default=30.0,
+                        help="Look back this far before the last run to catch late commits")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        import sqlite3
+
+        connection = sqlite3.connect(args.sqlite)
+        dialect = 'sqlite'
+    else:
+        import mysql.connector
+        from fire import DB_CONFIG
+
+        connection = mysql.connector.connect(**DB_CONFIG)
+        dialect = 'mysql'
+
+    try:
+        stats = ParquetExporter(connection, args.root, dialect, lag_seconds=args.lag_seconds).export()
+        print(f"Exported {stats['rows']:,} reports in {stats['months']} month partitions "
+              f"in {stats['seconds']:.2f} s")
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
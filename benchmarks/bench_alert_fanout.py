@@ -0,0 +1,94 @@
+"""Load benchmark for the proximity alert fan-out engine
+
+Runs thousands of watch subscriptions against an in-memory SQLite stand-in
+for the notifications table:
+
+    python benchmarks/bench_alert_fanout.py --subscribers 20000 --reports 500
+"""
+import argparse
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from alerts import AlertFanout  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--subscribers', type=int, default=20000)
+    parser.add_argument('--reports', type=int, default=500)
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    # Subscribers clustered over California, like a real deployment would be
+    watches = pd.DataFrame({
+        'recipient': [f"user{i}@example.com" for i in range(args.subscribers)],
+        'latitude': rng.uniform(32.5, 42.0, args.subscribers),
+        'longitude': rng.uniform(-124.4, -114.1, args.subscribers),
+        'radius_km': rng.choice([10.0, 25.0, 50.0, 100.0], args.subscribers),
+    })
+
+    db = sqlite3.connect(':memory:', check_same_thread=False)
+    db.execute("""
+    CREATE TABLE notifications (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        report_id INTEGER, recipient_email TEXT, message TEXT, notification_type TEXT,
+        location_description TEXT, severity TEXT
+    )
+    """)
+    db_lock = threading.Lock()
+
+    def write_notifications(rows):
+        with db_lock:
+            db.executemany(
+                "INSERT INTO notifications (report_id, recipient_email, message, notification_type, "
+                "location_description, severity) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            db.commit()
+
+    fanout = AlertFanout(lambda: watches, write_notifications, batch_size=args.batch_size)
+    fanout.registry()  # build the watch index outside the timed section
+
+    reports = [
+        {
+            'id': i,
+            'latitude': float(rng.uniform(32.5, 42.0)),
+            'longitude': float(rng.uniform(-124.4, -114.1)),
+            'severity': 'High',
+            'location_description': f"Benchmark location {i}",
+        }
+        for i in range(args.reports)
+    ]
+
+    start = time.perf_counter()
+    submit_times = []
+    for report in reports:
+        submit_start = time.perf_counter()
+        fanout.submit(report)
+        submit_times.append(time.perf_counter() - submit_start)
+    fanout.join()
+    elapsed = time.perf_counter() - start
+
+    stats = fanout.stats()
+    written = db.execute("SELECT COUNT(*) FROM notifications").fetchone()[0]
+    print(f"subscribers:            {args.subscribers}")
+    print(f"reports fanned out:     {stats['reports']} ({stats['errors']} errors)")
+    print(f"notifications written:  {written}")
+    print(f"total time:             {elapsed:.3f} s")
+    print(f"reports/s:              {stats['reports'] / elapsed:,.0f}")
+    print(f"notification rows/s:    {written / elapsed:,.0f}")
+    print(f"max submit latency:     {max(submit_times) * 1000:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""Throughput benchmark for batched report inserts
+
+Compares the old one-report-per-transaction path with chunked multi-row
+inserts on the embedded SQLite storage backend (full schema, indexes and
+rollup triggers included):
+
+    python benchmarks/bench_bulk_insert.py --reports 50000 --chunk-sizes 100 1000 5000
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from report_writes import insert_report_batch, insert_reports_bulk  # noqa: E402
+from storage import SQLiteStorage  # noqa: E402
+
+SEVERITIES = ['Low', 'Medium', 'High', 'Critical']
+FIRE_SIZES = ['Small (< 1 acre)', 'Medium (1-10 acres)', 'Large (10-100 acres)', 'Massive (> 100 acres)']
+
+
+def fake_reports(count, seed):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield (
+            f"Satellite feed {i}", None, None,
+            rng.uniform(32.5, 42.0), rng.uniform(-124.4, -114.1),
+            f"Detection {i}", rng.choice(FIRE_SIZES), rng.choice(SEVERITIES),
+            "Automated hotspot detection",
+        )
+
+
+def fresh_database(directory, name):
+    return SQLiteStorage(Path(directory) / f"{name}.db").borrow()
+
+
+def check(connection, report_ids):
+    """Every returned id must own exactly one matching notification"""
+    linked = connection.execute(
+        "SELECT COUNT(*) FROM notifications n JOIN wildfire_reports w ON n.report_id = w.id"
+    ).fetchone()[0]
+    assert linked == len(report_ids) == len(set(report_ids)), (linked, len(report_ids))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reports', type=int, default=20000)
+    parser.add_argument('--chunk-sizes', type=int, nargs='+', default=[100, 1000, 5000])
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        connection = fresh_database(directory, 'single')
+        start = time.perf_counter()
+        report_ids = []
+        for report in fake_reports(args.reports, args.seed):
+            report_ids.extend(insert_report_batch(connection, [report], dialect='sqlite'))
+        elapsed = time.perf_counter() - start
+        check(connection, report_ids)
+        connection.close()
+        print(f"{'single-row':>12}: {elapsed:7.3f} s  {args.reports / elapsed:12,.0f} reports/s")
+
+        for chunk_size in args.chunk_sizes:
+            connection = fresh_database(directory, f"bulk_{chunk_size}")
+            start = time.perf_counter()
+            report_ids = insert_reports_bulk(
+                connection, fake_reports(args.reports, args.seed), chunk_size=chunk_size, dialect='sqlite'
+            )
+            elapsed = time.perf_counter() - start
+            check(connection, report_ids)
+            connection.close()
+            print(f"{'chunk ' + str(chunk_size):>12}: {elapsed:7.3f} s  {args.reports / elapsed:12,.0f} reports/s")
+
+
+if __name__ == '__main__':
+    main()
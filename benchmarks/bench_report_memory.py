@@ -0,0 +1,88 @@
+"""Memory benchmark for the compact reports snapshot
+
+Builds a frame shaped like ``pd.read_sql`` output for the reports table
+(object strings, float64/Decimal-free coordinates, int64 flags, full
+descriptions), converts it with ``compact_reports`` and reports the deep
+bytes per row of both, checking the compact frame against
+``TARGET_BYTES_PER_ROW``:
+
+    python benchmarks/bench_report_memory.py --reports 200000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from report_cache import DeltaSync  # noqa: E402
+from report_schema import TARGET_BYTES_PER_ROW, bytes_per_row, compact_reports  # noqa: E402
+
+SEVERITIES = np.array(['Low', 'Medium', 'High', 'Critical'], dtype=object)
+STATUSES = np.array(['Active', 'Active', 'Active', 'Contained'], dtype=object)
+FIRE_SIZES = np.array(
+    ['Small (< 1 acre)', 'Medium (1-10 acres)', 'Large (10-100 acres)', 'Massive (> 100 acres)'], dtype=object
+)
+
+
+def raw_reports(count, seed, first_id=1):
+    """Frame with the dtypes pd.read_sql produces for wildfire_reports"""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(first_id, first_id + count)
+    reported_at = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365 * 86400, count), unit='s')
+    return pd.DataFrame({
+        'id': ids,
+        'reporter_name': [f"Reporter {i % 5000}" for i in ids],
+        'latitude': rng.uniform(32.5, 42.0, count),
+        'longitude': rng.uniform(-124.4, -114.1, count),
+        'location_description': [f"Near highway {i % 300}, mile marker {i % 97}" for i in ids],
+        'fire_size': FIRE_SIZES[rng.integers(0, 4, count)],
+        'severity': SEVERITIES[rng.integers(0, 4, count)],
+        'description': [f"Smoke column visible from ridge {i % 40}; wind gusting from the west, "
+                        f"structures within a mile of the flames." for i in ids],
+        'reported_at': reported_at,
+        'status': STATUSES[rng.integers(0, 4, count)],
+        'verified': rng.integers(0, 2, count),
+        'updated_at': reported_at,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reports', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    raw = raw_reports(args.reports, args.seed)
+    start = time.perf_counter()
+    compact = compact_reports(raw)
+    elapsed = time.perf_counter() - start
+
+    raw_bytes = bytes_per_row(raw)
+    compact_bytes = bytes_per_row(compact)
+    print(f"{'read_sql frame':>16}: {raw_bytes:8.1f} bytes/row  {raw_bytes * len(raw) / 2**20:8.1f} MiB")
+    print(f"{'compact frame':>16}: {compact_bytes:8.1f} bytes/row  {compact_bytes * len(compact) / 2**20:8.1f} MiB"
+          f"  ({raw_bytes / compact_bytes:.1f}x smaller, converted in {elapsed * 1000:.0f} ms)")
+    for column, size in compact.memory_usage(deep=True, index=False).items():
+        print(f"{column:>22}: {size / len(compact):6.1f} bytes/row  {compact[column].dtype}")
+
+    # A delta sync must keep the compact dtypes, including for unseen categories
+    batches = iter([compact, compact_reports(raw_reports(1000, args.seed + 1, first_id=args.reports + 1)
+                                             .assign(status='Extinguished'))])
+    sync = DeltaSync(lambda since_id, since_updated_at: next(batches))
+    sync.refresh()
+    merged = sync.refresh()
+    assert merged.dtypes.astype(str).equals(compact.dtypes.astype(str)), merged.dtypes
+    assert 'Extinguished' in merged['status'].cat.categories
+
+    assert compact_bytes <= TARGET_BYTES_PER_ROW, (
+        f"{compact_bytes:.1f} bytes/row is above the {TARGET_BYTES_PER_ROW} byte target"
+    )
+    print(f"Within the {TARGET_BYTES_PER_ROW} bytes/row target")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark for matching citizen reports against satellite detections
+
+Also verifies one report end to end against a temporary SQLite database
+with the process in a non-UTC time zone, since reports are stored in local
+time and FIRMS detections in UTC:
+
+    python benchmarks/bench_verification.py --reports 100000 --detections 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from spatial_index import haversine_km  # noqa: E402
+from verification import VerificationEngine, match_reports  # noqa: E402
+
+
+def random_points(rng, count, start, span_seconds):
+    latitude = rng.uniform(32.5, 42.0, count)
+    longitude = rng.uniform(-124.4, -114.1, count)
+    times = start + rng.integers(0, span_seconds, count).astype('timedelta64[s]')
+    return latitude, longitude, times
+
+
+def brute_force(reports, detections, max_km, max_hours):
+    """Reference O(N x M) answer for a small sample"""
+    matched = np.zeros(len(reports[0]), dtype=bool)
+    for i in range(len(reports[0])):
+        close = (
+            (np.abs((detections[2] - reports[2][i]).astype('timedelta64[s]').astype(np.int64)) <= max_hours * 3600)
+            & (haversine_km(reports[0][i], reports[1][i], detections[0], detections[1]) <= max_km)
+        )
+        matched[i] = close.any()
+    return matched
+
+
+def check_local_time(zone):
+    """A detection at the report's place and instant must verify it while TZ=zone"""
+    from report_writes import insert_report_batch
+    from storage import SQLiteStorage
+
+    previous = os.environ.get('TZ')
+    os.environ['TZ'] = zone
+    time.tzset()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            storage = SQLiteStorage(Path(directory) / 'verify.db')
+            connection = storage.borrow()
+            try:
+                insert_report_batch(connection, [('bench', None, None, 37.0, -120.0, 'check', None, 'High', None)],
+                                    storage.dialect)
+                connection.execute(
+                    "INSERT INTO satellite_detections (latitude, longitude, acquired_at) VALUES (?, ?, ?)",
+                    (37.0, -120.0, datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')),
+                )
+                connection.commit()
+                # Windows shorter than the zone's UTC offset, so a shift cannot still match
+                return VerificationEngine(connection, storage.dialect, max_hours=1.0, lookback_hours=1.0).run()
+            finally:
+                connection.close()
+    finally:
+        if previous is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = previous
+        time.tzset()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--reports', type=int, default=100000)
+    parser.add_argument('--detections', type=int, default=1000000)
+    parser.add_argument('--max-km', type=float, default=5.0)
+    parser.add_argument('--max-hours', type=float, default=12.0)
+    parser.add_argument('--days', type=int, default=90, help="Time span the points are spread over")
+    parser.add_argument('--check-sample', type=int, default=500, help="Reports re-checked by brute force")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--time-zone', default='America/Los_Angeles', help="Non-UTC zone for the SQLite check")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = np.datetime64('2025-06-01T00:00:00', 's')
+    span = args.days * 86400
+    reports = random_points(rng, args.reports, start, span)
+    detections = random_points(rng, args.detections, start, span)
+
+    began = time.perf_counter()
+    matched = match_reports(*reports, *detections, max_km=args.max_km, max_hours=args.max_hours)
+    elapsed = time.perf_counter() - began
+
+    print(f"reports x detections:  {args.reports:,} x {args.detections:,}")
+    print(f"verified reports:      {int(matched.sum()):,}")
+    print(f"grid join time:        {elapsed:.3f} s ({args.reports / elapsed:,.0f} reports/s)")
+
+    if args.check_sample:
+        sample = rng.choice(args.reports, min(args.check_sample, args.reports), replace=False)
+        expected = brute_force(tuple(column[sample] for column in reports), detections,
+                               args.max_km, args.max_hours)
+        assert np.array_equal(expected, matched[sample]), "grid join disagrees with brute force"
+        print(f"brute-force check:     {len(sample)} sampled reports agree")
+
+    stats = check_local_time(args.time_zone)
+    assert stats['detections'] == 1 and stats['verified'] == 1, f"local-time report not verified: {stats}"
+    print(f"local time check:      report stored in {args.time_zone} verified against a UTC detection")
+
+
+if __name__ == '__main__':
+    main()
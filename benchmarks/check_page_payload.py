@@ -0,0 +1,77 @@
+"""Payload check for the markup each rerun of fire.py sends to the browser
+
+Runs the app headlessly (streamlit.testing AppTest) against a temporary
+SQLite database, opens every page and measures the bytes of the markdown /
+HTML elements of each rerun. The app styles must arrive as one cached
+stylesheet link, never as inline <style> blocks:
+
+    python benchmarks/check_page_payload.py
+"""
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def markup_elements(app):
+    """Markdown elements of the main area and the sidebar"""
+    return list(app.markdown) + [element for element in app.sidebar.markdown if element not in app.markdown]
+
+
+def measure(app):
+    values = [element.value for element in markup_elements(app)]
+    return {
+        'bytes': sum(len(value.encode()) for value in values),
+        'style_blocks': sum(value.count('<style') for value in values),
+        'style_bytes': sum(len(part.split('</style>')[0].encode())
+                           for value in values for part in value.split('<style')[1:]),
+        'links': [value for value in values if '<link rel="stylesheet"' in value],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--timeout', type=float, default=60.0, help="Seconds allowed per rerun")
+    args = parser.parse_args()
+
+    from streamlit.testing.v1 import AppTest
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['WILDFIRE_STORAGE'] = 'sqlite'
+        os.environ['WILDFIRE_SQLITE_PATH'] = str(Path(directory) / 'payload.db')
+        os.environ['WILDFIRE_ANALYTICS_ROOT'] = str(Path(directory) / 'analytics')
+        app = AppTest.from_file(str(ROOT / 'fire.py'), default_timeout=args.timeout)
+        app.run()
+        assert not app.exception, app.exception
+        pages = list(app.sidebar.selectbox[0].options)
+
+        results = {}
+        for page in pages:
+            app.sidebar.selectbox[0].set_value(page).run()
+            assert not app.exception, f"{page}: {app.exception}"
+            results[page] = measure(app)
+
+    stylesheet = ROOT / 'static' / 'wildfire.css'
+    stylesheet_bytes = stylesheet.stat().st_size
+    digest = hashlib.sha256(stylesheet.read_bytes()).hexdigest()[:12]
+    for page, result in results.items():
+        print(f"{page:>28}: {result['bytes']:7,} bytes of markup per rerun, "
+              f"{result['style_blocks']} inline <style> blocks ({result['style_bytes']:,} bytes)")
+    print(f"{'stylesheet':>28}: {stylesheet_bytes:7,} bytes, fetched once per browser (v={digest})")
+
+    for page, result in results.items():
+        assert result['style_blocks'] == 0, f"{page} still inlines {result['style_bytes']:,} bytes of CSS per rerun"
+        assert len(result['links']) == 1, f"{page} should link the stylesheet exactly once"
+        href = result['links'][0].split('href="', 1)[1].split('"', 1)[0]
+        assert parse_qs(urlparse(href).query).get('v') == [digest], f"stale stylesheet version in {href}"
+    print("No inline styles; every page links the current stylesheet version")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Process-wide MySQL connection pool for the wildfire app"""
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+
+
+class PooledConnection:
+    """Borrowed connection handle; close() hands it back to the pool"""
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def close(self):
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            self._pool._release(connection)
+
+
+class ConnectionPool:
+    """Bounded MySQL connection pool with health checks on borrow"""
+
+    def __init__(self, db_config, pool_size=5, borrow_timeout=10.0,
+                 reconnect_attempts=3, reconnect_delay=0.5, pool_name='wildfire_pool'):
+        self.pool_size = pool_size
+        self.borrow_timeout = borrow_timeout
+        self.reconnect_attempts = reconnect_attempts
+        self.reconnect_delay = reconnect_delay
+        # mysql.connector's pool fails fast when exhausted, so the semaphore
+        # is what makes borrowers wait for a free connection
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name=pool_name,
+            pool_size=pool_size,
+            pool_reset_session=True,
+            **db_config
+        )
+        self._lock = threading.Lock()
+        self._stats = {
+            'borrows': 0,
+            'in_use': 0,
+            'wait_total': 0.0,
+            'wait_max': 0.0,
+            'timeouts': 0,
+            'reconnects': 0,
+        }
+
+    def borrow(self):
+        """Borrow a healthy connection, waiting up to borrow_timeout seconds"""
+        start = time.perf_counter()
+        if not self._slots.acquire(timeout=self.borrow_timeout):
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise PoolError(
+                f"No database connection available after {self.borrow_timeout}s"
+            )
+
+        try:
+            connection = self._pool.get_connection()
+        except mysql.connector.Error:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._stats['in_use'] += 1
+
+        try:
+            reconnected = self._ensure_connected(connection)
+        except mysql.connector.Error:
+            self._release(connection)
+            raise
+
+        waited = time.perf_counter() - start
+        with self._lock:
+            self._stats['borrows'] += 1
+            self._stats['wait_total'] += waited
+            self._stats['wait_max'] = max(self._stats['wait_max'], waited)
+            if reconnected:
+                self._stats['reconnects'] += 1
+        return PooledConnection(self, connection)
+
+    def _ensure_connected(self, connection):
+        """Ping the connection and reconnect it if the server dropped it"""
+        if connection.is_connected():
+            return False
+        connection.reconnect(attempts=self.reconnect_attempts, delay=self.reconnect_delay)
+        return True
+
+    def _release(self, connection):
+        try:
+            connection.close()
+        except mysql.connector.Error:
+            # A broken connection still goes back to the pool; the next
+            # borrow reconnects it
+            pass
+        finally:
+            with self._lock:
+                self._stats['in_use'] = max(self._stats['in_use'] - 1, 0)
+            self._slots.release()
+
+    def stats(self):
+        """Snapshot of pool counters, including borrow wait times in ms"""
+        with self._lock:
+            stats = dict(self._stats)
+        borrows = stats['borrows']
+        return {
+            'pool_size': self.pool_size,
+            'borrows': borrows,
+            'in_use': stats['in_use'],
+            'timeouts': stats['timeouts'],
+            'reconnects': stats['reconnects'],
+            'avg_wait_ms': (stats['wait_total'] / borrows * 1000) if borrows else 0.0,
+            'max_wait_ms': stats['wait_max'] * 1000,
+        }
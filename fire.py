@@ -1,12 +1,29 @@
 import streamlit as st
-import mysql.connector
 import pandas as pd
 import folium
 from streamlit_folium import st_folium
 from datetime import datetime
+import hashlib
+import html
+import os
 import time
 import streamlit.components.v1 as components
 import random
+from map_layers import ClusterPyramid, GeoJsonPoints, cluster_layer_json, report_layer_json
+from report_browser import PAGE_COLUMNS, PagePrefetcher, next_cursor, page_query
+from report_cache import DeltaSync, RenderCache, SnapshotCache, VersionedCache
+from report_events import REPORT_CREATED, EventReader
+from spatial_index import SpatialIndex
+from storage import STORAGE_ERRORS, open_storage
+from alerts import AlertFanout
+from analytics_store import AnalyticsStore
+from incidents import IncidentClusterer
+from live_updates import ChangeFeed
+from notification_inbox import INBOX_COLUMNS, inbox_page_query, mark_read, unread_count
+from submission_queue import SubmissionQueue
+from report_schema import compact_reports
+from report_writes import insert_report_batch, insert_reports_bulk
+from viewport import bounds_filter, bounds_from_map_state, padded_bounds
 
 st.set_page_config(
     page_title="Wildfire Reporting System",
@@ -23,6 +40,43 @@ COLORS = {
     'neutral': '#78716c'       # Warm gray
 }
 
+SEVERITY_COLORS = {
+    'Low': COLORS['accent1'],      # Golden yellow
+    'Medium': COLORS['primary'],   # Orange
+    'High': COLORS['secondary'],   # Dark orange
+    'Critical': COLORS['accent2']  # Red
+}
+
+SEVERITY_ORDER = ['Low', 'Medium', 'High', 'Critical']
+
+MAP_CLUSTER_MAX_ZOOM = 10  # Zoom levels up to this draw clusters instead of single reports
+MAP_PYRAMID_CACHE_ENTRIES = 16  # Cluster pyramids kept for recently shown data versions (map areas)
+MAP_VIEWPORT_MARGIN = 0.25  # Fraction of the visible area also loaded around it
+MAP_VIEWPORT_LIMIT = 5000   # Most recent reports drawn for one viewport
+MAP_LAZY_POPUPS = True      # Markers carry only ids; details load for the clicked marker
+REPORT_DETAIL_CACHE_SIZE = 256  # Clicked-report details kept in the LRU cache
+MAP_RENDER_CACHE_BYTES = 64 * 2**20  # Serialized map layers kept across reruns and sessions
+
+SPATIAL_INDEX_CELL_DEGREES = 0.5  # Grid cell size of the nearby-report index
+NEARBY_RADIUS_KM = 25             # Default danger radius for nearby-fire checks
+
+ALERT_BATCH_SIZE = 500               # Notification rows per INSERT batch
+ALERT_WATCH_REFRESH_INTERVAL = 60    # Seconds before watch locations are reloaded
+
+INCIDENT_EPS_KM = 2.0      # Reports closer than this (and INCIDENT_EPS_HOURS) are one incident
+INCIDENT_EPS_HOURS = 6.0
+NOTIFICATION_INCIDENT_FANIN = 5  # Notifications fetched per feed entry before collapsing by incident
+INBOX_PAGE_SIZE = 20  # Notifications per page of a recipient's alert inbox
+
+BULK_INSERT_CHUNK_SIZE = 1000  # Reports per multi-row INSERT in bulk imports
+SUBMISSION_MAX_BATCH = 100     # Reports written per INSERT batch
+SUBMISSION_MAX_WAIT = 0.05     # Seconds the writer waits to fill a batch
+SUBMISSION_POLL_INTERVAL = 2   # Seconds between submission status checks
+
+LIVE_UPDATE_INTERVAL = 5  # Seconds between refreshes of the live map and notification list
+LIVE_POLL_INTERVAL = 5    # Seconds between reads of report_events for changes by other processes
+LIVE_EVENT_BATCH_SIZE = 500  # report_events rows read per query
+
 DB_CONFIG = {
     'host': 'sql12.freesqldatabase.com',
     'database': 'sql12798735',
@@ -31,6 +85,27 @@ DB_CONFIG = {
     'port': 3306
 }
 
+DB_POOL_CONFIG = {
+    'pool_size': 5,            # Connections kept open per server process
+    'borrow_timeout': 10.0,    # Seconds to wait for a free connection
+    'reconnect_attempts': 3,
+    'reconnect_delay': 0.5
+}
+
+STORAGE_CONFIG = {
+    'backend': os.environ.get('WILDFIRE_STORAGE', 'mysql'),  # 'mysql' (DB_CONFIG) or embedded 'sqlite'
+    'sqlite_path': os.environ.get('WILDFIRE_SQLITE_PATH', 'wildfire_local.db')
+}
+
+REPORTS_CACHE_TTL = 30  # Seconds a shared reports snapshot stays fresh
+REPORTS_FULL_RELOAD_INTERVAL = 3600  # Seconds between full reloads; delta syncs in between
+REPORTS_DELTA_LAG_SECONDS = 30  # Delta syncs re-read this far behind updated_at to catch late commits
+REPORT_PAGE_SIZE = 50  # Rows per page in the Recent Reports browser
+ANALYTICS_ROOT = os.environ.get('WILDFIRE_ANALYTICS_ROOT', 'analytics')  # Parquet export written by analytics_store.py
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+STYLESHEET_NAME = 'wildfire.css'  # App styles, cached by the browser until the file changes
+REPORT_COUNTS_CACHE_TTL = 10  # Seconds the dashboard counters read from report_rollup stay fresh
+
 # Educational content for flashcards and game
 EDUCATIONAL_CONTENT = {
     "forest_protection": [
@@ -135,137 +210,895 @@ EDUCATIONAL_CONTENT = {
     ]
 }
 
+@st.cache_resource
+def get_stylesheet_href():
+    """URL of the app stylesheet, versioned by a hash of its content"""
+    # Streamlit's app static serving sends .css as text/plain (with nosniff),
+    # which browsers refuse as a stylesheet, so static/ is registered as a
+    # component asset directory instead: real MIME types, Cache-Control public
+    assets = components.declare_component("assets", path=STATIC_DIR)
+    with open(os.path.join(STATIC_DIR, STYLESHEET_NAME), 'rb') as stylesheet:
+        digest = hashlib.sha256(stylesheet.read()).hexdigest()[:12]
+    return f"component/{assets.name}/{STYLESHEET_NAME}?v={digest}"
+
+@st.cache_resource
+def get_storage():
+    """Open the configured storage backend once per Streamlit server process"""
+    # Background workers have no script context, so the cached builders of
+    # workers (alert fan-out, change feed, submission queue) call this and
+    # their other shared resources in the script thread and close over them
+    return open_storage(STORAGE_CONFIG, DB_CONFIG, DB_POOL_CONFIG)
+
 def get_db_connection():
-    """Create database connection"""
+    """Borrow a database connection from the storage backend (close() returns it)"""
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
+        connection = get_storage().borrow()
         return connection
-    except mysql.connector.Error as err:
+    except STORAGE_ERRORS as err:
         st.error(f"Database connection error: {err}")
         return None
 
+@st.cache_resource
+def get_change_feed():
+    """Report change events for the live map and notifications, shared by the server process"""
+    storage = get_storage()
+    reader = EventReader(storage.borrow, storage.dialect, batch_size=LIVE_EVENT_BATCH_SIZE)
+    
+    def load_changes():
+        changes = {}
+        for event in reader.read():
+            changes.setdefault(event['event_type'], []).append(event['report_id'])
+        return list(changes.items())
+    
+    feed = ChangeFeed(load_changes, poll_interval=LIVE_POLL_INTERVAL)
+    feed.start()
+    return feed
+
+@st.cache_resource
+def get_report_services():
+    """Process-wide objects that must hear about every new report"""
+    # Resolved once in a script thread; background workers reuse the dict
+    services = {
+        'reports_cache': get_reports_cache(),
+        'report_counts': get_report_counts_cache(),
+        'report_pages': get_report_pages(),
+        'spatial_index': get_spatial_index(),
+        'alert_fanout': get_alert_fanout(),
+        'change_feed': get_change_feed()
+    }
+    
+    def on_change(event):
+        # Changes made by another process only show up through report_events
+        if event['external']:
+            invalidate_report_caches(services)
+    
+    services['change_feed'].subscribe(on_change)
+    return services
+
+def invalidate_report_caches(services):
+    """Drop every shared view of wildfire_reports so the next read sees new rows"""
+    services['reports_cache'].invalidate()
+    services['report_counts'].invalidate()
+    services['report_pages'].invalidate()
+    get_reports_in_bounds.clear()
+
+def publish_new_reports(report_ids, batch, services):
+    """Make committed reports visible to the shared caches, the nearby index, proximity alerts and live views"""
+    invalidate_report_caches(services)
+    services['spatial_index']['index'].insert_many(report_ids, [data[3] for data in batch], [data[4] for data in batch])
+    for report_id, data in zip(report_ids, batch):
+        services['alert_fanout'].submit({
+            'id': report_id,
+            'latitude': data[3],
+            'longitude': data[4],
+            'location_description': data[5],
+            'severity': data[7]
+        })
+    services['change_feed'].publish(REPORT_CREATED, report_ids)
+
 def create_wildfire_report(data):
     """Insert new wildfire report into database"""
     connection = get_db_connection()
     if connection:
         try:
-            cursor = connection.cursor()
-            query = """
-            INSERT INTO wildfire_reports 
-            (reporter_name, reporter_email, reporter_phone, latitude, longitude, 
-             location_description, fire_size, severity, description)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(query, data)
-            report_id = cursor.lastrowid
-            
-            # Create notification for new report
-            severity_level = data[7]  # severity is at index 7
-            notification_type = 'Alert' if severity_level == 'Critical' else 'New Report'
-            notification_message = f"New wildfire reported: {data[6]} severity in {data[5]}"
-            
-            notification_query = """
-            INSERT INTO notifications (report_id, message, notification_type)
-            VALUES (%s, %s, %s)
-            """
-            cursor.execute(notification_query, (report_id, notification_message, notification_type))
-            
-            connection.commit()
-            return True
-        except mysql.connector.Error as err:
+            report_ids = insert_report_batch(connection, [data], get_storage().dialect)
+        except STORAGE_ERRORS as err:
             st.error(f"Error creating report: {err}")
             return False
         finally:
             connection.close()
+        publish_new_reports(report_ids, [data], get_report_services())
+        return True
     return False
 
+def create_wildfire_reports_bulk(reports, chunk_size=BULK_INSERT_CHUNK_SIZE):
+    """Insert many report tuples (e.g. partner imports) in chunked multi-row INSERTs; returns the ids saved"""
+    connection = get_db_connection()
+    if connection:
+        services = get_report_services()
+        created_ids = []
+        
+        def publish_chunk(report_ids, chunk):
+            created_ids.extend(report_ids)
+            publish_new_reports(report_ids, chunk, services)
+        
+        try:
+            insert_reports_bulk(connection, reports, chunk_size=chunk_size, dialect=get_storage().dialect,
+                                on_chunk=publish_chunk)
+        except STORAGE_ERRORS as err:
+            # Chunks committed before the error stay saved
+            st.error(f"Error creating reports after {len(created_ids)} were saved: {err}")
+        finally:
+            connection.close()
+        return created_ids
+    return []
+
+@st.cache_resource
+def get_submission_queue():
+    """Background writer for submitted reports, shared by the server process"""
+    storage = get_storage()
+    services = get_report_services()
+    
+    def write_batch(batch):
+        connection = storage.borrow()
+        try:
+            report_ids = insert_report_batch(connection, batch, storage.dialect)
+        finally:
+            connection.close()
+        return report_ids
+    
+    def on_saved(report_ids, batch):
+        publish_new_reports(report_ids, batch, services)
+    
+    return SubmissionQueue(write_batch, on_saved=on_saved,
+                           max_batch=SUBMISSION_MAX_BATCH, max_wait=SUBMISSION_MAX_WAIT)
+
+@st.fragment(run_every=SUBMISSION_POLL_INTERVAL)
+def show_submission_status():
+    """Poll queued submissions without re-running the whole page"""
+    tokens = st.session_state.get('submitted_reports', [])[-5:]
+    if not tokens:
+        return
+    
+    # The live map fragment picks up saved reports on its own
+    submission_queue = get_submission_queue()
+    for token in tokens:
+        status = submission_queue.status(token)
+        if status is None:
+            continue
+        if status['state'] == 'saved':
+            st.success(f"✅ Report #{status['report_id']} saved. Authorities have been notified.")
+        elif status['state'] == 'failed':
+            st.error(f"❌ Report {token[:8]} could not be saved: {status['error']}")
+        else:
+            st.info(f"⏳ Report {token[:8]} received and queued for saving...")
+
+def fetch_wildfire_reports(since_id=None, since_updated_at=None):
+    """Query wildfire reports, optionally only rows changed since a high-water mark (raises on database errors)"""
+    storage = get_storage()
+    p = storage.placeholder
+    connection = storage.borrow()
+    try:
+        query = """
+        SELECT id, reporter_name, latitude, longitude, location_description, 
+               fire_size, severity, reported_at, status, verified, updated_at
+        FROM wildfire_reports 
+        """
+        params = None
+        if since_id is not None:
+            query += f"WHERE id > {p} OR updated_at >= {p} "
+            params = (since_id, since_updated_at.to_pydatetime())
+        query += "ORDER BY reported_at DESC"
+        return compact_reports(pd.read_sql(query, connection, params=params))
+    finally:
+        connection.close()
+
+@st.cache_resource(ttl=REPORTS_CACHE_TTL, max_entries=256)
+def get_reports_in_bounds(bounds):
+    """Reports inside padded, grid-snapped map bounds (shared read-only DataFrame)"""
+    storage = get_storage()
+    clause, params = bounds_filter(bounds, storage.placeholder)
+    connection = storage.borrow()
+    try:
+        query = f"""
+        SELECT id, reporter_name, latitude, longitude, location_description, 
+               fire_size, severity, reported_at, status, verified, updated_at
+        FROM wildfire_reports 
+        WHERE {clause}
+        ORDER BY reported_at DESC
+        LIMIT {storage.placeholder}
+        """
+        return compact_reports(pd.read_sql(query, connection, params=params + (MAP_VIEWPORT_LIMIT,)))
+    finally:
+        connection.close()
+
+def fetch_report_descriptions(report_ids, batch_size=1000):
+    """description column for the given report ids, loaded on demand (id -> text)"""
+    storage = get_storage()
+    report_ids = [int(report_id) for report_id in report_ids]
+    descriptions = {}
+    connection = storage.borrow()
+    try:
+        cursor = connection.cursor()
+        for offset in range(0, len(report_ids), batch_size):
+            batch = report_ids[offset:offset + batch_size]
+            placeholders = ', '.join([storage.placeholder] * len(batch))
+            cursor.execute(f"SELECT id, description FROM wildfire_reports WHERE id IN ({placeholders})", batch)
+            descriptions.update(cursor.fetchall())
+        cursor.close()
+    finally:
+        connection.close()
+    return descriptions
+
+@st.cache_resource(ttl=REPORTS_CACHE_TTL, max_entries=REPORT_DETAIL_CACHE_SIZE)
+def fetch_report_detail(report_id):
+    """Popup fields of one report, or None if it no longer exists (shared read-only dict)"""
+    storage = get_storage()
+    connection = storage.borrow()
+    try:
+        query = f"""
+        SELECT id, reporter_name, location_description, fire_size, severity,
+               description, reported_at, status, verified
+        FROM wildfire_reports
+        WHERE id = {storage.placeholder}
+        """
+        detail_df = pd.read_sql(query, connection, params=(report_id,))
+    finally:
+        connection.close()
+    return None if detail_df.empty else detail_df.iloc[0].to_dict()
+
+def clicked_report_id(map_state):
+    """Id of the report marker clicked in the last st_folium render, if any"""
+    if not map_state or not map_state.get('last_object_clicked'):
+        return None
+    feature = map_state.get('last_active_drawing') or {}
+    if feature.get('id') is None or 'count' in feature.get('properties', {}):
+        # Cluster markers have no report behind them
+        return None
+    return int(feature['id'])
+
+def show_report_detail(report_id, map_df):
+    """Detail card for the clicked map marker"""
+    try:
+        detail = fetch_report_detail(report_id)
+    except STORAGE_ERRORS as err:
+        st.error(f"Error loading report details: {err}")
+        return
+    if detail is None:
+        st.info("This report is no longer available.")
+        return
+    
+    merged_reports = 1
+    if 'report_count' in map_df:
+        counts = map_df.loc[map_df['id'] == report_id, 'report_count']
+        merged_reports = int(counts.iloc[0]) if not counts.empty else 1
+    incident_note = f" • 🔁 {merged_reports} reports of this fire" if merged_reports > 1 else ""
+    severity_color = SEVERITY_COLORS.get(detail['severity'], COLORS['neutral'])
+    description = html.escape(str(detail['description'] or ''))
+    st.markdown(f"""
+    <div style="background: white; padding: 1.5rem; border-radius: 16px; margin: 1rem 0; box-shadow: 0 8px 25px rgba(217, 119, 6, 0.1); border-left: 4px solid {severity_color};">
+        <h4 style="color: {severity_color}; margin: 0 0 0.5rem 0;">📍 {html.escape(str(detail['location_description']))}{incident_note}</h4>
+        <p style="margin: 0 0 0.5rem 0; color: #44403c;"><b>{html.escape(str(detail['severity']))}</b> severity • {html.escape(str(detail['fire_size']))} • {html.escape(str(detail['status']))}{' • ✅ Verified' if detail['verified'] else ''}</p>
+        <p style="margin: 0 0 0.5rem 0; color: #44403c;">{description}</p>
+        <p style="margin: 0; color: #78716c; font-size: 0.9rem;">Reported by {html.escape(str(detail['reporter_name']))} • {detail['reported_at']}</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+def with_descriptions(reports_df):
+    """Copy of a reports frame with the description column the hot snapshot leaves out"""
+    try:
+        descriptions = fetch_report_descriptions(reports_df['id'])
+    except STORAGE_ERRORS as err:
+        st.error(f"Error fetching report descriptions: {err}")
+        return reports_df
+    return reports_df.assign(description=reports_df['id'].map(descriptions))
+
+def get_viewport_reports(map_bounds):
+    """Reports visible in the previous map render plus a margin"""
+    try:
+        return get_reports_in_bounds(padded_bounds(map_bounds, MAP_VIEWPORT_MARGIN))
+    except STORAGE_ERRORS as err:
+        st.error(f"Error fetching reports: {err}")
+        return pd.DataFrame()
+
+@st.cache_resource
+def get_report_sync():
+    """In-process copy of wildfire_reports refreshed with delta queries"""
+    return DeltaSync(fetch_wildfire_reports, full_reload_interval=REPORTS_FULL_RELOAD_INTERVAL,
+                     lag_seconds=REPORTS_DELTA_LAG_SECONDS)
+
+@st.cache_resource
+def get_reports_cache():
+    """Reports snapshot shared by every session in this server process"""
+    return SnapshotCache(get_report_sync().refresh, ttl=REPORTS_CACHE_TTL)
+
 def get_wildfire_reports():
-    """Fetch all wildfire reports from database"""
+    """Fetch all wildfire reports from the shared snapshot (read-only DataFrame)"""
+    try:
+        return get_reports_cache().get()
+    except STORAGE_ERRORS as err:
+        st.error(f"Error fetching reports: {err}")
+        return pd.DataFrame()
+
+def fetch_report_counts():
+    """Report counts by severity, status and verified, summed over days from report_rollup"""
+    connection = get_storage().borrow()
+    try:
+        query = """
+        SELECT severity, status, verified, SUM(report_count) AS report_count
+        FROM report_rollup
+        GROUP BY severity, status, verified
+        """
+        return pd.read_sql(query, connection)
+    finally:
+        connection.close()
+
+@st.cache_resource
+def get_report_counts_cache():
+    """Rollup counters shared by every session in this server process"""
+    return SnapshotCache(fetch_report_counts, ttl=REPORT_COUNTS_CACHE_TTL)
+
+def get_report_counts():
+    """Dashboard counters (total, critical, active, verified) without loading any reports"""
+    try:
+        counts_df = get_report_counts_cache().get()
+    except STORAGE_ERRORS as err:
+        st.error(f"Error fetching report counts: {err}")
+        return {'total': 0, 'critical': 0, 'active': 0, 'verified': 0}
+    
+    report_count = counts_df['report_count'].astype(int)
+    return {
+        'total': int(report_count.sum()),
+        'critical': int(report_count[counts_df['severity'] == 'Critical'].sum()),
+        'active': int(report_count[counts_df['status'] == 'Active'].sum()),
+        'verified': int(report_count[counts_df['verified'] == 1].sum())
+    }
+
+@st.cache_resource
+def get_report_pages():
+    """Recent Reports pages shared by every session, with background prefetch"""
+    storage = get_storage()
+    
+    def load_page(filters, after):
+        # One extra row tells whether another page follows
+        query, params = page_query(after=after, limit=REPORT_PAGE_SIZE + 1,
+                                   placeholder=storage.placeholder, **dict(filters))
+        connection = storage.borrow()
+        try:
+            return pd.read_sql(query, connection, params=params)
+        finally:
+            connection.close()
+    
+    return PagePrefetcher(load_page, ttl=REPORTS_CACHE_TTL)
+
+def show_report_browser():
+    """Recent Reports table, fetched one keyset page at a time"""
+    try:
+        # Filter choices come from the rollup, not from scanning the reports
+        statuses = get_report_counts_cache().get()['status'].unique().tolist()
+    except STORAGE_ERRORS as err:
+        st.error(f"Error fetching report statuses: {err}")
+        return
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        severity = st.selectbox("Severity", ["All"] + SEVERITY_ORDER, key="browse_severity")
+    with col2:
+        status = st.selectbox("Status", ["All"] + sorted(statuses), key="browse_status")
+    with col3:
+        date_range = st.date_input("Reported between", value=(), key="browse_dates")
+    with col4:
+        newest_first = st.selectbox("Sort", ["Newest first", "Oldest first"], key="browse_sort") == "Newest first"
+    
+    filters = (
+        ('severity', None if severity == "All" else severity),
+        ('status', None if status == "All" else status),
+        ('date_from', date_range[0] if len(date_range) > 0 else None),
+        ('date_to', date_range[1] if len(date_range) > 1 else None),
+        ('newest_first', newest_first)
+    )
+    if st.session_state.get('browse_filters') != filters:
+        st.session_state.browse_filters = filters
+        st.session_state.browse_cursors = [None]
+    cursors = st.session_state.browse_cursors
+    
+    pages = get_report_pages()
+    try:
+        page_df = pages.get((filters, cursors[-1]))
+    except STORAGE_ERRORS as err:
+        st.error(f"Error fetching reports: {err}")
+        return
+    
+    has_more = len(page_df) > REPORT_PAGE_SIZE
+    page_df = page_df.head(REPORT_PAGE_SIZE)
+    following = None
+    if has_more:
+        following = next_cursor(page_df)
+        pages.prefetch((filters, following))
+    
+    if page_df.empty:
+        st.info("No reports match these filters.")
+    else:
+        st.dataframe(page_df[list(PAGE_COLUMNS[1:])], use_container_width=True, hide_index=True)
+    
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("⬅️ Previous", disabled=len(cursors) == 1, on_click=cursors.pop, use_container_width=True)
+    with col_page:
+        st.caption(f"Page {len(cursors)} • {REPORT_PAGE_SIZE} reports per page")
+    with col_next:
+        st.button("Next ➡️", disabled=not has_more, on_click=cursors.append, args=(following,), use_container_width=True)
+
+@st.cache_resource
+def get_analytics_store():
+    """Parquet analytics store shared by every session"""
+    return AnalyticsStore(ANALYTICS_ROOT)
+
+def show_historical_trends():
+    """Monthly and regional report counts from the Parquet export, off the transactional database"""
+    store = get_analytics_store()
+    months = store.months()
+    if not months:
+        st.info("Historical trends appear after the first analytics export (python analytics_store.py).")
+        return
+    
+    if len(months) > 1:
+        start_month, end_month = st.select_slider("Months", options=months, value=(months[0], months[-1]))
+    else:
+        start_month = end_month = months[0]
+    
+    start = time.perf_counter()
+    monthly_df = store.counts(['month', 'severity'], start_month, end_month)
+    regional_df = store.counts(['region'], start_month, end_month)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### Reports per month by severity")
+        st.line_chart(monthly_df.pivot(index='month', columns='severity', values='reports').fillna(0))
+    with col2:
+        st.markdown("#### Busiest regions")
+        st.bar_chart(regional_df.set_index('region')['reports'].nlargest(15))
+    st.caption(f"Aggregated {int(regional_df['reports'].sum()):,} exported reports in {elapsed_ms:.0f} ms")
+
+def get_notifications(limit=10):
+    """Fetch recent notifications"""
     connection = get_db_connection()
     if connection:
         try:
-            query = """
-            SELECT id, reporter_name, latitude, longitude, location_description, 
-                   fire_size, severity, description, reported_at, status, verified
-            FROM wildfire_reports 
-            ORDER BY reported_at DESC
+            query = f"""
+            SELECT report_id, message, notification_type, created_at, is_read,
+                   location_description, severity
+            FROM notifications
+            WHERE recipient_email IS NULL
+            ORDER BY created_at DESC
+            LIMIT {get_storage().placeholder}
             """
-            df = pd.read_sql(query, connection)
+            df = pd.read_sql(query, connection, params=(limit,))
             return df
-        except mysql.connector.Error as err:
-            st.error(f"Error fetching reports: {err}")
+        except STORAGE_ERRORS as err:
+            st.error(f"Error fetching notifications: {err}")
             return pd.DataFrame()
         finally:
             connection.close()
     return pd.DataFrame()
 
-def get_notifications():
-    """Fetch recent notifications"""
+def get_incident_notifications(limit=10):
+    """Recent notifications with duplicate reports of one incident collapsed into a single entry"""
+    notifications_df = get_notifications(limit=limit * NOTIFICATION_INCIDENT_FANIN)
+    if notifications_df.empty:
+        return notifications_df
+    
+    # Make sure the clusterer has seen every report the feed refers to
+    get_incidents(get_wildfire_reports())
+    incident_ids = get_incident_cache()['clusterer'].incident_ids(notifications_df['report_id'])
+    notifications_df = notifications_df.assign(incident_id=incident_ids)
+    notifications_df['incident_reports'] = notifications_df.groupby('incident_id')['report_id'].transform('size')
+    return notifications_df.drop_duplicates('incident_id').head(limit)
+
+@st.fragment(run_every=LIVE_UPDATE_INTERVAL)
+def show_live_notifications():
+    """Notification feed, re-queried only after the change feed reports new reports"""
+    version = get_report_services()['change_feed'].version()
+    cached = st.session_state.get('notifications_feed')
+    if cached is not None and cached[0] == version:
+        notifications_df = cached[1]
+    else:
+        notifications_df = get_incident_notifications()
+        if not notifications_df.empty:
+            st.session_state.notifications_feed = (version, notifications_df)
+    
+    if not notifications_df.empty:
+        for _, notification in notifications_df.iterrows():
+            alert_color = COLORS['accent2'] if notification['notification_type'] == 'Alert' else COLORS['primary']
+            repeat_note = f" • 🔁 {notification['incident_reports']} reports of this fire" if notification['incident_reports'] > 1 else ""
+            st.markdown(f"""
+            <div style="background: white; padding: 1.5rem; border-radius: 16px; margin: 1rem 0; box-shadow: 0 8px 25px rgba(217, 119, 6, 0.1); border-left: 4px solid {alert_color};">
+                <h4 style="color: {alert_color}; margin: 0 0 0.5rem 0;">{notification['notification_type']}{repeat_note}</h4>
+                <p style="margin: 0 0 0.5rem 0; font-weight: 600;">{notification['message']}</p>
+                <p style="margin: 0; color: #78716c; font-size: 0.9rem;">📍 {notification['location_description']} • {notification['created_at']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.info("No notifications available.")
+
+def get_unread_count(recipient):
+    """Unread alerts of a recipient, from the trigger-maintained counter"""
     connection = get_db_connection()
     if connection:
+        try:
+            return unread_count(connection, recipient, get_storage().placeholder)
+        except STORAGE_ERRORS as err:
+            st.error(f"Error fetching unread alerts: {err}")
+            return 0
+        finally:
+            connection.close()
+    return 0
+
+def get_inbox_page(recipient, after=None, unread_only=True):
+    """One keyset page of a recipient's alerts plus one extra row if another page follows"""
+    connection = get_db_connection()
+    if connection:
+        try:
+            query, params = inbox_page_query(recipient, after=after, limit=INBOX_PAGE_SIZE + 1,
+                                             unread_only=unread_only, placeholder=get_storage().placeholder)
+            df = pd.read_sql(query, connection, params=params)
+            df['created_at'] = pd.to_datetime(df['created_at'])
+            return df
+        except STORAGE_ERRORS as err:
+            st.error(f"Error fetching alerts: {err}")
+            return pd.DataFrame(columns=list(INBOX_COLUMNS))
+        finally:
+            connection.close()
+    return pd.DataFrame(columns=list(INBOX_COLUMNS))
+
+def mark_notifications_read(recipient, notification_ids=None):
+    """Mark a recipient's alerts (all unread ones if notification_ids is None) as read"""
+    connection = get_db_connection()
+    if connection:
+        try:
+            mark_read(connection, recipient, notification_ids, get_storage().placeholder)
+        except STORAGE_ERRORS as err:
+            st.error(f"Error updating alerts: {err}")
+        finally:
+            connection.close()
+    # Pages after the first may have shifted
+    st.session_state.inbox_cursors = [None]
+
+def show_notification_inbox():
+    """Proximity alerts of one recipient, one keyset page at a time, with bulk mark-as-read"""
+    recipient = st.text_input("Email used for your watched locations",
+                              value=st.session_state.get('inbox_recipient', ''), placeholder="your.email@example.com")
+    if not recipient:
+        st.info("Enter the email address of a watched location to see its alerts.")
+        return
+    st.session_state.inbox_recipient = recipient
+    unread_only = st.toggle("Unread only", value=True, key="inbox_unread_only")
+    
+    filters = (recipient, unread_only)
+    if st.session_state.get('inbox_filters') != filters:
+        st.session_state.inbox_filters = filters
+        st.session_state.inbox_cursors = [None]
+    cursors = st.session_state.inbox_cursors
+    
+    page_df = get_inbox_page(recipient, cursors[-1], unread_only)
+    has_more = len(page_df) > INBOX_PAGE_SIZE
+    page_df = page_df.head(INBOX_PAGE_SIZE)
+    
+    unread = get_unread_count(recipient)
+    st.caption(f"{unread} unread alert{'s' if unread != 1 else ''}")
+    if page_df.empty:
+        st.info("No unread alerts." if unread_only else "No alerts yet.")
+    for _, notification in page_df.iterrows():
+        weight = 600 if not notification['is_read'] else 400
+        st.markdown(f"""
+        <div style="background: white; padding: 1rem 1.5rem; border-radius: 12px; margin: 0.5rem 0; box-shadow: 0 4px 12px rgba(217, 119, 6, 0.1); border-left: 4px solid {COLORS['accent2']};">
+            <p style="margin: 0 0 0.25rem 0; font-weight: {weight};">{html.escape(str(notification['message']))}</p>
+            <p style="margin: 0; color: #78716c; font-size: 0.9rem;">{notification['created_at']}</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    page_unread = page_df.loc[page_df['is_read'] == 0, 'id'].astype(int).tolist()
+    col_page_read, col_all_read = st.columns(2)
+    with col_page_read:
+        st.button("✅ Mark page as read", disabled=not page_unread, on_click=mark_notifications_read,
+                  args=(recipient, page_unread), use_container_width=True)
+    with col_all_read:
+        st.button("✅ Mark all as read", disabled=not unread, on_click=mark_notifications_read,
+                  args=(recipient,), use_container_width=True)
+    
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        st.button("⬅️ Newer", disabled=len(cursors) == 1, on_click=cursors.pop, use_container_width=True,
+                  key="inbox_newer")
+    with col_page:
+        st.caption(f"Page {len(cursors)} • {INBOX_PAGE_SIZE} alerts per page")
+    with col_next:
+        st.button("Older ➡️", disabled=not has_more, on_click=cursors.append,
+                  args=(next_cursor(page_df, 'created_at') if has_more else None,), use_container_width=True, key="inbox_older")
+
+@st.cache_resource
+def get_spatial_index():
+    """Nearby-report index shared by every session, fed from the reports snapshot"""
+    return {'source': None, 'index': SpatialIndex(cell_degrees=SPATIAL_INDEX_CELL_DEGREES)}
+
+def get_nearby_reports(latitude, longitude, radius_km=NEARBY_RADIUS_KM):
+    """Reports within radius_km of a point, nearest first, with a distance_km column"""
+    reports_df = get_wildfire_reports()
+    if reports_df.empty:
+        return reports_df
+    
+    cache = get_spatial_index()
+    if cache['source'] is not reports_df:
+        # Only ids not yet indexed are added
+        cache['index'].insert_many(reports_df['id'], reports_df['latitude'], reports_df['longitude'])
+        cache['source'] = reports_df
+    
+    ids, distances = cache['index'].within_radius(latitude, longitude, radius_km)
+    distance_by_id = pd.Series(distances, index=ids, name='distance_km')
+    nearby = reports_df[reports_df['id'].isin(ids)].join(distance_by_id, on='id')
+    return nearby.sort_values('distance_km')
+
+def create_watch_location(recipient_email, latitude, longitude, radius_km):
+    """Register a location a user wants proximity alerts for"""
+    connection = get_db_connection()
+    if connection:
+        try:
+            cursor = connection.cursor()
+            p = get_storage().placeholder
+            query = f"""
+            INSERT INTO watch_locations (recipient_email, latitude, longitude, radius_km)
+            VALUES ({p}, {p}, {p}, {p})
+            """
+            cursor.execute(query, (recipient_email, latitude, longitude, radius_km))
+            connection.commit()
+            get_alert_fanout().invalidate_watches()
+            return True
+        except STORAGE_ERRORS as err:
+            st.error(f"Error saving watch location: {err}")
+            return False
+        finally:
+            connection.close()
+    return False
+
+@st.cache_resource
+def get_alert_fanout():
+    """Background proximity-alert worker shared by the server process"""
+    storage = get_storage()
+    p = storage.placeholder
+    
+    def load_watches():
+        connection = storage.borrow()
         try:
             query = """
-            SELECT n.message, n.notification_type, n.created_at, n.is_read,
-                   w.location_description, w.severity
-            FROM notifications n
-            JOIN wildfire_reports w ON n.report_id = w.id
-            ORDER BY n.created_at DESC
-            LIMIT 10
+            SELECT recipient_email AS recipient, latitude, longitude, radius_km
+            FROM watch_locations
             """
-            df = pd.read_sql(query, connection)
-            return df
-        except mysql.connector.Error as err:
-            st.error(f"Error fetching notifications: {err}")
-            return pd.DataFrame()
+            return pd.read_sql(query, connection)
         finally:
             connection.close()
-    return pd.DataFrame()
+    
+    def write_notifications(rows):
+        connection = storage.borrow()
+        try:
+            cursor = connection.cursor()
+            query = f"""
+            INSERT INTO notifications (report_id, recipient_email, message, notification_type,
+                                       location_description, severity)
+            VALUES ({p}, {p}, {p}, {p}, {p}, {p})
+            """
+            cursor.executemany(query, rows)
+            connection.commit()
+        finally:
+            connection.close()
+    
+    return AlertFanout(load_watches, write_notifications, batch_size=ALERT_BATCH_SIZE,
+                       watch_refresh_interval=ALERT_WATCH_REFRESH_INTERVAL,
+                       incident_km=INCIDENT_EPS_KM, incident_hours=INCIDENT_EPS_HOURS,
+                       clusterer=get_incident_cache()['clusterer'])
+
+@st.cache_resource
+def get_incident_cache():
+    """Incident clustering state shared by every session"""
+    return {
+        'incidents': VersionedCache(max_entries=2),  # Summaries of the latest snapshots, by data version
+        'clusterer': IncidentClusterer(eps_km=INCIDENT_EPS_KM, eps_hours=INCIDENT_EPS_HOURS)
+    }
+
+def get_incidents(reports_df):
+    """Reports merged into incidents: one row per fire, same columns plus incident_id and report_count"""
+    cache = get_incident_cache()
+    
+    def summarize():
+        if not reports_df.empty:
+            # Only reports not clustered yet are added
+            cache['clusterer'].add_reports(
+                reports_df['id'], reports_df['latitude'], reports_df['longitude'], reports_df['reported_at'].to_numpy()
+            )
+        return cache['clusterer'].summarize(reports_df, SEVERITY_ORDER)
+    
+    return cache['incidents'].get(map_data_version(reports_df), summarize)
+
+@st.cache_resource
+def get_cluster_cache():
+    """Cluster pyramids shared by every session, keyed by map data version"""
+    return VersionedCache(max_entries=MAP_PYRAMID_CACHE_ENTRIES)
+
+def get_cluster_pyramid(reports_df, data_version=None):
+    """Per-zoom grid clusters, reused for the same data_version (built fresh without one)"""
+    def build():
+        return ClusterPyramid(reports_df, SEVERITY_ORDER, max_zoom=MAP_CLUSTER_MAX_ZOOM)
+    if data_version is None:
+        return build()
+    return get_cluster_cache().get(data_version, build)
 
-def create_map(reports_df):
-    """Create folium map with wildfire markers"""
+@st.cache_resource
+def get_render_cache():
+    """Serialized map layers shared by every session, keyed by data version"""
+    return RenderCache(max_bytes=MAP_RENDER_CACHE_BYTES)
+
+def map_data_version(reports_df):
+    """Token that changes whenever reports are added to or updated in reports_df"""
     if reports_df.empty:
+        return (0, None, None)
+    updated_at = reports_df['updated_at'].max() if 'updated_at' in reports_df else None
+    return (len(reports_df), int(reports_df['id'].max()), updated_at)
+
+def build_map_layer(reports_df, zoom, cluster, lazy_popups, data_version=None):
+    """(kind, GeoJSON text) of the marker layer for a zoom level"""
+    if cluster:
+        pyramid = get_cluster_pyramid(reports_df, data_version)
+        data = cluster_layer_json(pyramid, zoom, SEVERITY_COLORS, COLORS['neutral'])
+        if data is not None:
+            return 'clusters', data
+    # All markers go out as one GeoJSON layer styled from feature properties
+    if lazy_popups:
+        return 'reports', report_layer_json(reports_df, SEVERITY_COLORS, COLORS['neutral'], popups=False)
+    return 'reports', report_layer_json(with_descriptions(reports_df), SEVERITY_COLORS, COLORS['neutral'])
+
+def create_map(reports_df, view=None, cluster=True, lazy_popups=MAP_LAZY_POPUPS, data_version=None):
+    """Create folium map with wildfire markers, clustered at low zoom levels
+
+    With a data_version (see map_data_version, plus any filters applied to
+    reports_df) the serialized marker layer is reused until the data changes.
+    """
+    if view:
+        # Keep the zoom and position from the previous render
+        center_lat, center_lon = view['center']
+        zoom = view['zoom']
+    elif reports_df.empty:
         # Default map centered on California
-        m = folium.Map(location=[36.7783, -119.4179], zoom_start=6, tiles='OpenStreetMap', attr='OpenStreetMap')
+        center_lat, center_lon = 36.7783, -119.4179
+        zoom = 6
+    else:
+        # Center map on average coordinates
+        center_lat = reports_df['latitude'].mean()
+        center_lon = reports_df['longitude'].mean()
+        zoom = 7
+    m = folium.Map(location=[center_lat, center_lon], zoom_start=zoom, tiles='OpenStreetMap', attr='OpenStreetMap')
+    if reports_df.empty:
         return m
     
-    # Center map on average coordinates
-    center_lat = reports_df['latitude'].mean()
-    center_lon = reports_df['longitude'].mean()
-    m = folium.Map(location=[center_lat, center_lon], zoom_start=7, tiles='OpenStreetMap', attr='OpenStreetMap')
+    # At low zoom only aggregated clusters are sent to the browser
+    start = time.perf_counter()
+    if cluster and zoom <= MAP_CLUSTER_MAX_ZOOM:
+        layer_key = ('clusters', max(int(zoom), 0))
+    else:
+        layer_key = ('reports', lazy_popups)
+    cache_key = (data_version, layer_key) if data_version is not None else None
+    data = get_render_cache().get(cache_key) if cache_key is not None else None
+    st.session_state.map_layer_cached = data is not None
+    if data is None:
+        kind, data = build_map_layer(reports_df, zoom, cluster, lazy_popups, data_version)
+        if cache_key is not None:
+            get_render_cache().put(cache_key, data)
+    else:
+        kind = layer_key[0]
+    if kind == 'clusters':
+        GeoJsonPoints(data, popup_field='popup', tooltip_field='count').add_to(m)
+    else:
+        GeoJsonPoints(data, popup_field=None if lazy_popups else 'popup').add_to(m)
+    st.session_state.map_build_ms = (time.perf_counter() - start) * 1000
     
-    severity_colors = {
-        'Low': COLORS['accent1'],      # Golden yellow
-        'Medium': COLORS['primary'],   # Orange
-        'High': COLORS['secondary'],   # Dark orange
-        'Critical': COLORS['accent2']  # Red
-    }
+    return m
+
+@st.fragment(run_every=LIVE_UPDATE_INTERVAL)
+def show_live_map():
+    """Map metrics, map and clicked-report detail, refreshed every LIVE_UPDATE_INTERVAL seconds without re-running the page"""
+    feed = get_report_services()['change_feed']
+    seen_version = st.session_state.get('map_feed_version')
+    st.session_state.map_feed_version = feed.version()
+    if seen_version is not None:
+        events = feed.events_since(seen_version, topics={REPORT_CREATED})
+        new_reports = sum(len(event['ids']) for event in events or [])
+        if new_reports:
+            st.toast(f"🔥 {new_reports} new wildfire report{'s' if new_reports > 1 else ''} on the map")
     
-    # Add markers for each report
-    for _, report in reports_df.iterrows():
-        color = severity_colors.get(report['severity'], COLORS['neutral'])
-        
-        popup_text = f"""
-        <b>Location:</b> {report['location_description']}<br>
-        <b>Reporter:</b> {report['reporter_name']}<br>
-        <b>Severity:</b> {report['severity']}<br>
-        <b>Size:</b> {report['fire_size']}<br>
-        <b>Status:</b> {report['status']}<br>
-        <b>Reported:</b> {report['reported_at']}<br>
-        <b>Description:</b> {report['description'][:100]}...
-        """
-        
-        folium.CircleMarker(
-            location=[report['latitude'], report['longitude']],
-            radius=10 if report['severity'] != 'Critical' else 15,
-            popup=folium.Popup(popup_text, max_width=300),
-            color=color,
-            fill=True,
-            fillColor=color,
-            fillOpacity=0.7,
-            weight=2
-        ).add_to(m)
+    # The toggle is drawn below the metrics, so read its state first: in
+    # viewport mode the full reports snapshot is never loaded
+    map_bounds = st.session_state.get('map_bounds')
+    viewport_mode = st.session_state.get('map_viewport_mode', True) and bool(map_bounds)
+    if viewport_mode:
+        reports_df = None
+        report_counts = get_report_counts()
+        has_reports = report_counts['total'] > 0
+    else:
+        reports_df = get_wildfire_reports()
+        has_reports = not reports_df.empty
     
-    return m
+    if has_reports:
+        col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
+        if viewport_mode:
+            # Whole-database totals from the rollup; incidents need every report
+            with col_stat1:
+                st.metric("Reports", report_counts['total'], delta=None)
+            with col_stat2:
+                st.metric("Critical", report_counts['critical'], delta=None)
+            with col_stat3:
+                st.metric("Active", report_counts['active'], delta=None)
+            with col_stat4:
+                st.metric("Verified", report_counts['verified'], delta=None)
+        else:
+            incidents_df = get_incidents(reports_df)
+            with col_stat1:
+                st.metric("Incidents", len(incidents_df), delta=None, help=f"{len(reports_df)} reports")
+            with col_stat2:
+                critical_count = len(incidents_df[incidents_df['severity'] == 'Critical'])
+                st.metric("Critical", critical_count, delta=None)
+            with col_stat3:
+                active_count = len(incidents_df[incidents_df['status'] == 'Active'])
+                st.metric("Active", active_count, delta=None)
+            with col_stat4:
+                verified_count = len(incidents_df[incidents_df['verified'] == 1])
+                st.metric("Verified", verified_count, delta=None)
+    
+        col_toggle1, col_toggle2 = st.columns(2)
+        with col_toggle1:
+            st.toggle("📐 Load only the visible map area", value=True, key="map_viewport_mode")
+        with col_toggle2:
+            incident_mode = st.toggle("🔥 Group duplicate reports into incidents", value=True)
+        map_df = reports_df
+        map_area = None
+        if viewport_mode:
+            map_area = padded_bounds(map_bounds, MAP_VIEWPORT_MARGIN)
+            map_df = get_viewport_reports(map_bounds)
+        map_version = (map_data_version(map_df), map_area, incident_mode)
+        if incident_mode:
+            if map_df is reports_df:
+                map_df = incidents_df
+            else:
+                clusterer = get_incident_cache()['clusterer']
+                if not map_df.empty:
+                    clusterer.add_reports(map_df['id'], map_df['latitude'], map_df['longitude'],
+                                          map_df['reported_at'].to_numpy())
+                map_df = clusterer.summarize(map_df, SEVERITY_ORDER)
+    
+        st.markdown('<div class="map-container">', unsafe_allow_html=True)
+        wildfire_map = create_map(map_df, view=st.session_state.get('map_view'), data_version=map_version)
+        map_state = st_folium(wildfire_map, width=None, height=800)
+        remember_map_view(map_state)
+        layer_source = 'served from cache' if st.session_state.get('map_layer_cached') else 'built'
+        st.caption(f"Map layer {layer_source} in {st.session_state.get('map_build_ms', 0):.0f} ms for {len(map_df)} {'incidents' if incident_mode else 'reports'}")
+        st.markdown("</div>", unsafe_allow_html=True)
+    
+        report_id = clicked_report_id(map_state)
+        if report_id is not None:
+            show_report_detail(report_id, map_df)
+    
+    else:
+        st.info("📍 No wildfire reports available. Be the first to report!")
+        st.markdown('<div class="map-container">', unsafe_allow_html=True)
+        default_map = create_map(pd.DataFrame())
+        st_folium(default_map, width=None, height=800)
+        st.markdown("</div>", unsafe_allow_html=True)
+
+def remember_map_view(map_state):
+    """Store the zoom, center and bounds st_folium reports for the next rerun"""
+    if map_state and map_state.get('zoom') is not None and map_state.get('center'):
+        st.session_state.map_view = {
+            'zoom': map_state['zoom'],
+            'center': (map_state['center']['lat'], map_state['center']['lng'])
+        }
+        st.session_state.map_bounds = bounds_from_map_state(map_state)
 
 def get_user_location():
     """Enhanced location detection with proper form integration"""
@@ -460,6 +1293,9 @@ def create_flashcards(category, title):
             """, unsafe_allow_html=True)
 
 def main():
+    # A short <link> per rerun instead of the stylesheet itself
+    st.markdown(f'<link rel="stylesheet" href="{get_stylesheet_href()}">', unsafe_allow_html=True)
+    
     with st.sidebar:
         st.markdown(f"""
         <div style="text-align: center; padding: 2.5rem 1rem; background: linear-gradient(135deg, #dc2626 0%, #ea580c 50%, #d97706 100%); border-radius: 24px; margin-bottom: 2rem; box-shadow: 0 15px 40px rgba(220, 38, 38, 0.4); position: relative; overflow: hidden;">
@@ -473,32 +1309,6 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
-        st.markdown("""
-        <style>
-        @keyframes rotate {
-            from { transform: rotate(0deg); }
-            to { transform: rotate(360deg); }
-        }
-        
-        .sidebar-nav {
-            background: linear-gradient(135deg, #ffffff 0%, #fef7ed 100%);
-            border-radius: 20px;
-            padding: 1.5rem;
-            margin-bottom: 2rem;
-            box-shadow: 0 10px 30px rgba(217, 119, 6, 0.15);
-            border: 1px solid rgba(217, 119, 6, 0.1);
-        }
-        
-        .sidebar-nav h3 {
-            color: #dc2626;
-            margin: 0 0 1rem 0;
-            font-size: 1.1rem;
-            font-weight: 700;
-            text-align: center;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
         st.markdown('<div class="sidebar-nav"><h3>📍 Navigate</h3></div>', unsafe_allow_html=True)
         
         page = st.selectbox("", [
@@ -515,20 +1325,20 @@ def main():
 
         st.markdown("---")
         
-        reports_df = get_wildfire_reports()
-        if not reports_df.empty:
+        report_counts = get_report_counts()
+        if report_counts['total']:
             st.markdown(f"""
             <div style="background: linear-gradient(135deg, #f97316 0%, #ea580c 100%); padding: 2rem 1.5rem; border-radius: 20px; color: white; text-align: center; margin: 1rem 0; box-shadow: 0 12px 35px rgba(249, 115, 22, 0.4); position: relative; overflow: hidden;">
                 <div style="position: absolute; top: -20px; right: -20px; width: 80px; height: 80px; background: rgba(255,255,255,0.1); border-radius: 50%; opacity: 0.6;"></div>
                 <div style="position: relative; z-index: 1;">
                     <div style="font-size: 2rem; margin-bottom: 0.5rem;">📊</div>
-                    <h3 style="margin: 0 0 0.5rem 0; font-size: 2.5rem; font-weight: 900; text-shadow: 2px 2px 6px rgba(0,0,0,0.3);">{len(reports_df)}</h3>
+                    <h3 style="margin: 0 0 0.5rem 0; font-size: 2.5rem; font-weight: 900; text-shadow: 2px 2px 6px rgba(0,0,0,0.3);">{report_counts['active']}</h3>
                     <p style="margin: 0; font-size: 1rem; font-weight: 600; opacity: 0.95;">Active Reports</p>
                 </div>
             </div>
             """, unsafe_allow_html=True)
             
-            critical_count = len(reports_df[reports_df['severity'] == 'Critical'])
+            critical_count = report_counts['critical']
             if critical_count > 0:
                 st.markdown(f"""
                 <div style="background: linear-gradient(135deg, #dc2626 0%, #b91c1c 100%); padding: 2rem 1.5rem; border-radius: 20px; color: white; text-align: center; margin: 1rem 0; box-shadow: 0 12px 35px rgba(220, 38, 38, 0.5); animation: pulse 3s infinite; position: relative; overflow: hidden;">
@@ -541,6 +1351,12 @@ def main():
                 </div>
                 """, unsafe_allow_html=True)
         
+        inbox_recipient = st.session_state.get('inbox_recipient')
+        if inbox_recipient:
+            unread = get_unread_count(inbox_recipient)
+            if unread:
+                st.markdown(f"**🔔 {unread} unread alert{'s' if unread > 1 else ''}** for {html.escape(inbox_recipient)}")
+        
         st.markdown("---")
         
         st.markdown(f"""
@@ -556,147 +1372,6 @@ def main():
         </div>
         """, unsafe_allow_html=True)
 
-    st.markdown(f"""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&display=swap');
-    
-    .main .block-container {{
-        padding-top: 1rem;
-        padding-left: 1rem;
-        padding-right: 1rem;
-        max-width: none;
-    }}
-    
-    .main {{
-        font-family: 'Inter', sans-serif;
-        background: linear-gradient(135deg, #fef7ed 0%, #fed7aa 50%, #fdba74 100%);
-        min-height: 100vh;
-    }}
-    
-    @keyframes pulse {{
-        0% {{ transform: scale(1); }}
-        50% {{ transform: scale(1.05); }}
-        100% {{ transform: scale(1); }}
-    }}
-    
-    /* Professional Info Cards */
-    .info-card-container {{
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(280px, 1fr));
-        gap: 1.5rem;
-        margin: 2rem 0;
-    }}
-    
-    .info-card {{
-        background: linear-gradient(135deg, white 0%, #fefbf7 100%);
-        padding: 2rem;
-        border-radius: 20px;
-        box-shadow: 0 10px 40px rgba(217, 119, 6, 0.15);
-        border: 1px solid rgba(217, 119, 6, 0.1);
-        transition: all 0.3s ease;
-        position: relative;
-        overflow: hidden;
-    }}
-    
-    .info-card::before {{
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 4px;
-        background: linear-gradient(90deg, {COLORS['primary']}, {COLORS['accent2']});
-    }}
-    
-    .info-card:hover {{
-        transform: translateY(-8px);
-        box-shadow: 0 20px 60px rgba(217, 119, 6, 0.25);
-    }}
-    
-    /* Enhanced Form Styling */
-    .stForm {{
-        background: white;
-        padding: 3rem;
-        border-radius: 24px;
-        box-shadow: 0 20px 60px rgba(217, 119, 6, 0.15);
-        border: 1px solid rgba(217, 119, 6, 0.1);
-        margin: 2rem 0;
-    }}
-    
-    /* Button Enhancement */
-    .stButton > button {{
-        background: linear-gradient(135deg, {COLORS['accent2']}, {COLORS['primary']});
-        color: white;
-        border: none;
-        border-radius: 16px;
-        padding: 1.2rem 3rem;
-        font-weight: 800;
-        font-size: 1.2rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 8px 30px rgba(220, 38, 38, 0.3);
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        width: 100%;
-    }}
-    
-    .stButton > button:hover {{
-        transform: translateY(-4px);
-        box-shadow: 0 12px 40px rgba(220, 38, 38, 0.4);
-        background: linear-gradient(135deg, #ef4444, {COLORS['accent2']});
-    }}
-    
-    /* Map Container Enhancement */
-    .map-container {{
-        background: white;
-        padding: 2rem;
-        border-radius: 24px;
-        box-shadow: 0 20px 60px rgba(217, 119, 6, 0.15);
-        margin: 2rem 0;
-        border: 1px solid rgba(217, 119, 6, 0.1);
-    }}
-    
-    /* Section Headers */
-    .section-header {{
-        background: linear-gradient(135deg, {COLORS['primary']}, {COLORS['accent2']});
-        color: white;
-        padding: 2rem;
-        border-radius: 20px;
-        margin: 3rem 0 2rem 0;
-        box-shadow: 0 10px 40px rgba(217, 119, 6, 0.3);
-        text-align: center;
-        position: relative;
-        overflow: hidden;
-    }}
-    
-    .section-header h2 {{
-        margin: 0;
-        font-size: 2.2rem;
-        font-weight: 800;
-        position: relative;
-        z-index: 1;
-        text-shadow: 2px 2px 8px rgba(0,0,0,0.3);
-    }}
-    
-    /* Input Styling */
-    .stTextInput > div > div > input,
-    .stNumberInput > div > div > input {{
-        border-radius: 12px;
-        border: 2px solid #fed7aa;
-        padding: 1rem;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-        background: white;
-    }}
-    
-    .stTextInput > div > div > input:focus,
-    .stNumberInput > div > div > input:focus {{
-        border-color: {COLORS['primary']};
-        box-shadow: 0 0 0 4px rgba(217, 119, 6, 0.1);
-        outline: none;
-    }}
-    </style>
-    """, unsafe_allow_html=True)
-
     st.markdown(f"""
     <div style="position: relative; width: 100%; height: 400px; border-radius: 20px; overflow: hidden; margin-bottom: 3rem; box-shadow: 0 20px 60px rgba(0,0,0,0.2);">
         <img src="https://hebbkx1anhila5yf.public.blob.vercel-storage.com/image-1lcMKcg8W3Ub1CNyJcfB6HHe3Vlc3e.png" style="width: 100%; height: 100%; object-fit: cover;">
@@ -710,8 +1385,6 @@ def main():
     """, unsafe_allow_html=True)
 
     if page == "🚨 Emergency Reporting":
-        reports_df = get_wildfire_reports()
-        
         st.markdown("""
         <div class="info-card-container">
             <div class="info-card">
@@ -732,10 +1405,10 @@ def main():
             <div class="info-card">
                 <p class="info-card-number">{}</p>
                 <h3 class="info-card-title">Active Reports</h3>
-                <p class="info-card-description">Total wildfire incidents currently being monitored by our system.</p>
+                <p class="info-card-description">Wildfire reports still marked active and being monitored by our system.</p>
             </div>
         </div>
-        """.format(len(reports_df) if not reports_df.empty else 0), unsafe_allow_html=True)
+        """.format(get_report_counts()['active']), unsafe_allow_html=True)
 
         col1, col2 = st.columns([1.2, 1.8], gap="large")
         
@@ -790,85 +1463,51 @@ def main():
                             fire_size, severity, description
                         )
                         
-                        if create_wildfire_report(report_data):
-                            st.success("✅ Emergency report submitted! Authorities have been notified.")
-                            st.balloons()
-                            time.sleep(2)
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to submit report. Please try again.")
+                        token = get_submission_queue().submit(report_data)
+                        st.session_state.setdefault('submitted_reports', []).append(token)
+                        st.success(f"✅ Emergency report received (tracking token {token[:8]}). Saving now...")
+                        st.balloons()
                     else:
                         st.error("⚠️ Please fill in all required fields marked with *")
+            
+            show_submission_status()
 
         with col2:
             st.markdown('<div class="section-header"><h2>🗺️ Live Wildfire Map</h2></div>', unsafe_allow_html=True)
             
-            if not reports_df.empty:
-                col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
-                with col_stat1:
-                    st.metric("Total Reports", len(reports_df), delta=None)
-                with col_stat2:
-                    critical_count = len(reports_df[reports_df['severity'] == 'Critical'])
-                    st.metric("Critical", critical_count, delta=None)
-                with col_stat3:
-                    active_count = len(reports_df[reports_df['status'] == 'Active'])
-                    st.metric("Active", active_count, delta=None)
-                with col_stat4:
-                    verified_count = len(reports_df[reports_df['verified'] == 1])
-                    st.metric("Verified", verified_count, delta=None)
-                
-                st.markdown('<div class="map-container">', unsafe_allow_html=True)
-                wildfire_map = create_map(reports_df)
-                st_folium(wildfire_map, width=None, height=800)
-                st.markdown("</div>", unsafe_allow_html=True)
-                
-            else:
-                st.info("📍 No wildfire reports available. Be the first to report!")
-                st.markdown('<div class="map-container">', unsafe_allow_html=True)
-                default_map = create_map(pd.DataFrame())
-                st_folium(default_map, width=None, height=800)
-                st.markdown("</div>", unsafe_allow_html=True)
+            show_live_map()
 
     elif page == "📊 Statistics & Reports":
         st.markdown('<div class="section-header"><h2>📊 Wildfire Statistics & Reports</h2></div>', unsafe_allow_html=True)
         
-        reports_df = get_wildfire_reports()
-        if not reports_df.empty:
+        report_counts = get_report_counts()
+        if report_counts['total']:
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
-                st.metric("Total Reports", len(reports_df))
+                st.metric("Total Reports", report_counts['total'])
             with col2:
-                critical_count = len(reports_df[reports_df['severity'] == 'Critical'])
-                st.metric("Critical Fires", critical_count)
+                st.metric("Critical Fires", report_counts['critical'])
             with col3:
-                active_count = len(reports_df[reports_df['status'] == 'Active'])
-                st.metric("Active Fires", active_count)
+                st.metric("Active Fires", report_counts['active'])
             with col4:
-                verified_count = len(reports_df[reports_df['verified'] == 1])
-                st.metric("Verified Reports", verified_count)
+                st.metric("Verified Reports", report_counts['verified'])
+            
+            st.markdown("### 📈 Historical Trends")
+            show_historical_trends()
             
             st.markdown("### 📋 Recent Reports")
-            st.dataframe(reports_df[['reporter_name', 'location_description', 'severity', 'fire_size', 'status', 'reported_at']], use_container_width=True)
+            show_report_browser()
         else:
             st.info("No reports available yet.")
 
     elif page == "🔔 Notifications":
         st.markdown('<div class="section-header"><h2>🔔 Emergency Notifications</h2></div>', unsafe_allow_html=True)
         
-        notifications_df = get_notifications()
-        if not notifications_df.empty:
-            for _, notification in notifications_df.iterrows():
-                alert_color = COLORS['accent2'] if notification['notification_type'] == 'Alert' else COLORS['primary']
-                st.markdown(f"""
-                <div style="background: white; padding: 1.5rem; border-radius: 16px; margin: 1rem 0; box-shadow: 0 8px 25px rgba(217, 119, 6, 0.1); border-left: 4px solid {alert_color};">
-                    <h4 style="color: {alert_color}; margin: 0 0 0.5rem 0;">{notification['notification_type']}</h4>
-                    <p style="margin: 0 0 0.5rem 0; font-weight: 600;">{notification['message']}</p>
-                    <p style="margin: 0; color: #78716c; font-size: 0.9rem;">📍 {notification['location_description']} • {notification['created_at']}</p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.info("No notifications available.")
+        show_live_notifications()
+        
+        st.markdown("### 📬 My Alerts")
+        show_notification_inbox()
 
     elif page == "🎮 Safety Challenge":
         create_flashcard_game()
@@ -882,6 +1521,34 @@ def main():
     elif page == "⚠️ Fire Nearby":
         create_flashcards("fire_nearby", "⚠️ How to Protect Yourself When Fire is Nearby")
         
+        st.markdown("### 📡 Check for Reported Fires Near You")
+        col_lat, col_lon, col_radius = st.columns(3)
+        with col_lat:
+            check_lat = st.number_input("Latitude", value=0.0, format="%.6f", key="nearby_lat")
+        with col_lon:
+            check_lon = st.number_input("Longitude", value=0.0, format="%.6f", key="nearby_lon")
+        with col_radius:
+            radius_km = st.number_input("Radius (km)", min_value=1, max_value=500, value=NEARBY_RADIUS_KM)
+        
+        if st.button("🔍 Check Nearby Reports", use_container_width=True):
+            nearby_df = get_nearby_reports(check_lat, check_lon, radius_km)
+            if not nearby_df.empty:
+                st.warning(f"⚠️ {len(nearby_df)} wildfire report(s) within {radius_km} km of your location")
+                st.dataframe(nearby_df[['location_description', 'severity', 'status', 'distance_km', 'reported_at']], use_container_width=True)
+            else:
+                st.success(f"✅ No wildfire reports within {radius_km} km of your location")
+        
+        with st.form("watch_location"):
+            st.markdown("**🔔 Get alerted when a fire is reported within this radius**")
+            watch_email = st.text_input("Email Address*", placeholder="your.email@example.com")
+            if st.form_submit_button("📡 Watch This Location"):
+                if watch_email and check_lat != 0.0 and check_lon != 0.0:
+                    if create_watch_location(watch_email, check_lat, check_lon, radius_km):
+                        st.session_state.inbox_recipient = watch_email
+                        st.success(f"✅ You will be alerted about fires within {radius_km} km of this location.")
+                else:
+                    st.error("⚠️ Please enter your email and the location above")
+        
     elif page == "🏥 Survivor Resources":
         create_flashcards("survivor_locations", "🏥 Locations That Provide Necessities for Survivors")
     elif page == "🚀 Future Improvements":
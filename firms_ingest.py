@@ -0,0 +1,220 @@
+"""Streaming ingestion of NASA FIRMS active-fire CSV files
+
+Reads VIIRS or MODIS archives (plain, .gz or single-file .zip) from local
+disk in fixed-size chunks, so memory stays flat however large the file is,
+and bulk-loads the detections into ``satellite_detections``:
+
+    python firms_ingest.py fire_archive_SV-C2_2024.csv --chunk-size 200000
+    python firms_ingest.py fire_nrt_M-C61.csv.gz --sqlite wildfire_local.db
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+FIRMS_COLUMNS = {
+    'latitude', 'longitude', 'brightness', 'bright_ti4', 'confidence',
+    'acq_date', 'acq_time', 'satellite', 'instrument', 'frp', 'daynight'
+}
+
+DETECTION_COLUMNS = (
+    'latitude', 'longitude', 'acquired_at', 'brightness', 'confidence',
+    'frp', 'satellite', 'instrument', 'daynight'
+)
+
+# Matches the DECIMAL(9, 5) / DECIMAL(10, 5) columns of satellite_detections
+COORDINATE_DECIMALS = 5
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS satellite_detections (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    acquired_at TEXT NOT NULL,
+    brightness REAL,
+    confidence TEXT,
+    frp REAL,
+    satellite TEXT,
+    instrument TEXT,
+    daynight TEXT,
+    ingested_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (latitude, longitude, acquired_at)
+);
+CREATE INDEX IF NOT EXISTS idx_detections_acquired ON satellite_detections (acquired_at);
+"""
+
+INSERT_QUERIES = {
+    # Plain INSERT ... VALUES keeps mysql.connector's multi-row executemany
+    # rewrite; the no-op update skips rows that already exist
+    'mysql': f"""
+    INSERT INTO satellite_detections ({', '.join(DETECTION_COLUMNS)})
+    VALUES ({', '.join(['%s'] * len(DETECTION_COLUMNS))})
+    ON DUPLICATE KEY UPDATE id = id
+    """,
+    'sqlite': f"""
+    INSERT OR IGNORE INTO satellite_detections ({', '.join(DETECTION_COLUMNS)})
+    VALUES ({', '.join(['?'] * len(DETECTION_COLUMNS))})
+    """,
+}
+
+
+def normalize_firms_chunk(chunk):
+    """Map a raw VIIRS/MODIS chunk onto the satellite_detections columns
+
+    Rows without coordinates or a parseable acquisition time are dropped.
+    """
+    chunk = chunk.rename(columns=str.lower)
+    if 'brightness' not in chunk and 'bright_ti4' in chunk:
+        # VIIRS reports the I-4 channel brightness temperature instead
+        chunk = chunk.rename(columns={'bright_ti4': 'brightness'})
+
+    acq_time = chunk['acq_time'].astype('Int64').astype(str).str.zfill(4)
+    detections = pd.DataFrame({
+        'latitude': pd.to_numeric(chunk['latitude'], errors='coerce').round(COORDINATE_DECIMALS),
+        'longitude': pd.to_numeric(chunk['longitude'], errors='coerce').round(COORDINATE_DECIMALS),
+        'acquired_at': pd.to_datetime(
+            chunk['acq_date'].astype(str) + ' ' + acq_time, format='%Y-%m-%d %H%M', errors='coerce'
+        ),
+    })
+    for column in ('brightness', 'frp'):
+        detections[column] = pd.to_numeric(chunk[column], errors='coerce') if column in chunk else np.nan
+    for column in ('confidence', 'satellite', 'instrument', 'daynight'):
+        detections[column] = chunk[column].astype('string').str.strip() if column in chunk else None
+    if 'confidence' in chunk:
+        # MODIS confidence is 0-100, VIIRS is l/n/h; store both as text
+        detections['confidence'] = detections['confidence'].str.lower()
+
+    return detections.dropna(subset=['latitude', 'longitude', 'acquired_at'])
+
+
+def detection_keys(detections):
+    """64-bit hash of (latitude, longitude, acquired_at) per row"""
+    return pd.util.hash_pandas_object(
+        detections[['latitude', 'longitude', 'acquired_at']], index=False
+    ).to_numpy()
+
+
+def read_firms_chunks(path, chunk_size=100000):
+    """Yield (raw_row_count, normalized detections) per chunk of at most chunk_size rows"""
+    reader = pd.read_csv(
+        path,
+        chunksize=chunk_size,
+        usecols=lambda column: column.lower() in FIRMS_COLUMNS,
+        dtype={'acq_date': str, 'confidence': str, 'satellite': str, 'instrument': str, 'daynight': str},
+    )
+    with reader:
+        for chunk in reader:
+            yield len(chunk), normalize_firms_chunk(chunk)
+
+
+class FirmsIngester:
+    """Bulk loader from FIRMS CSV files into satellite_detections
+
+    Duplicates are dropped within each chunk and against the previous chunk
+    (FIRMS archives are time-ordered, so repeats sit close together); the
+    table's unique key catches anything further apart.
+    """
+
+    def __init__(self, connection, dialect='mysql', insert_batch=5000):
+        self.connection = connection
+        self.dialect = dialect
+        self.insert_batch = insert_batch
+
+    def ingest_file(self, path, chunk_size=100000, progress=None):
+        """Stream one file into the database; returns ingestion counters
+
+        ``progress(stats)`` is called after every chunk.
+        """
+        stats = {
+            'rows_read': 0, 'rows_invalid': 0, 'duplicates': 0, 'rows_inserted': 0,
+            'seconds': 0.0, 'rows_per_second': 0.0
+        }
+        previous_keys = np.empty(0, dtype=np.uint64)
+        start = time.perf_counter()
+        for raw_rows, detections in read_firms_chunks(path, chunk_size):
+            stats['rows_read'] += raw_rows
+            stats['rows_invalid'] += raw_rows - len(detections)
+            keys = detection_keys(detections)
+            fresh = ~pd.Series(keys).duplicated().to_numpy() & ~np.isin(keys, previous_keys)
+            stats['duplicates'] += int((~fresh).sum())
+            stats['rows_inserted'] += self.insert_detections(detections[fresh])
+            previous_keys = keys
+
+            stats['seconds'] = time.perf_counter() - start
+            stats['rows_per_second'] = stats['rows_read'] / stats['seconds'] if stats['seconds'] else 0.0
+            if progress is not None:
+                progress(stats)
+        return stats
+
+    def insert_detections(self, detections):
+        """Insert normalized detections in batches; returns rows actually inserted"""
+        if detections.empty:
+            return 0
+        detections = detections.assign(
+            acquired_at=detections['acquired_at'].dt.strftime('%Y-%m-%d %H:%M:%S')
+        )
+        # NaN -> None so the drivers write SQL NULL
+        rows = list(
+            detections[list(DETECTION_COLUMNS)]
+            .astype(object)
+            .where(detections[list(DETECTION_COLUMNS)].notna(), None)
+            .itertuples(index=False, name=None)
+        )
+        query = INSERT_QUERIES[self.dialect]
+        inserted = 0
+        cursor = self.connection.cursor()
+        try:
+            for offset in range(0, len(rows), self.insert_batch):
+                cursor.executemany(query, rows[offset:offset + self.insert_batch])
+                inserted += max(cursor.rowcount, 0)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+        return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest NASA FIRMS active-fire CSV files")
+    parser.add_argument('paths', nargs='+', help="FIRMS CSV files (.csv, .csv.gz or .zip)")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="Rows read per chunk")
+    parser.add_argument('--insert-batch', type=int, default=5000, help="Rows per multi-row INSERT")
+    parser.add_argument('--sqlite', metavar='PATH', help="Load into a local SQLite file instead of MySQL")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        import sqlite3
+
+        connection = sqlite3.connect(args.sqlite)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SQLITE_SCHEMA)
+        dialect = 'sqlite'
+    else:
+        import mysql.connector
+        from fire import DB_CONFIG
+
+        connection = mysql.connector.connect(**DB_CONFIG)
+        dialect = 'mysql'
+
+    def progress(stats):
+        print(f"  {stats['rows_read']:,} rows read, {stats['rows_inserted']:,} inserted, "
+              f"{stats['rows_per_second']:,.0f} rows/s", flush=True)
+
+    ingester = FirmsIngester(connection, dialect=dialect, insert_batch=args.insert_batch)
+    try:
+        for path in args.paths:
+            print(f"Ingesting {path}")
+            stats = ingester.ingest_file(path, chunk_size=args.chunk_size, progress=progress)
+            print(f"Done: {stats['rows_read']:,} rows read, {stats['rows_invalid']:,} invalid, "
+                  f"{stats['duplicates']:,} duplicates skipped, "
+                  f"{stats['rows_inserted']:,} inserted in {stats['seconds']:.1f} s "
+                  f"({stats['rows_per_second']:,.0f} rows/s)")
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Incremental grouping of duplicate reports into fire incidents"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from spatial_index import SpatialIndex
+
+
+class IncidentClusterer:
+    """DBSCAN-style clustering (min_samples = 1) over distance and time
+
+    Two reports belong to the same incident when they are within eps_km and
+    eps_hours of each other, directly or through a chain of such reports.
+    Reports are added incrementally; each one only looks up its neighbours
+    in a spatial index and merges their incidents with a union-find, so the
+    cost per report does not grow with the history.
+    """
+
+    def __init__(self, eps_km=2.0, eps_hours=6.0, cell_degrees=0.1):
+        self.eps_km = eps_km
+        self.eps_seconds = eps_hours * 3600
+        self._index = SpatialIndex(cell_degrees=cell_degrees)
+        self._times = {}
+        self._parent = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._parent)
+
+    def _find(self, report_id):
+        root = report_id
+        while self._parent[root] != root:
+            root = self._parent[root]
+        # Path compression keeps later lookups O(1)
+        while self._parent[report_id] != root:
+            self._parent[report_id], report_id = root, self._parent[report_id]
+        return root
+
+    def _union(self, first, second):
+        first, second = self._find(first), self._find(second)
+        if first != second:
+            # The oldest report id names the incident
+            root, child = min(first, second), max(first, second)
+            self._parent[child] = root
+
+    def add_reports(self, report_ids, latitudes, longitudes, reported_at):
+        """Assign new reports to incidents; returns {report_id: started_new_incident}
+
+        Report ids already clustered are skipped.
+        """
+        report_ids = np.asarray(report_ids, dtype=np.int64)
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+        seconds = np.asarray(reported_at, dtype='datetime64[s]').astype(np.int64)
+
+        started = {}
+        with self._lock:
+            for report_id, lat, lon, when in zip(report_ids.tolist(), latitudes.tolist(),
+                                                 longitudes.tolist(), seconds.tolist()):
+                if report_id in self._parent:
+                    continue
+                neighbours, _ = self._index.within_radius(lat, lon, self.eps_km)
+                self._parent[report_id] = report_id
+                self._times[report_id] = when
+                self._index.insert(report_id, lat, lon)
+                linked = False
+                for neighbour in neighbours.tolist():
+                    if abs(self._times[neighbour] - when) <= self.eps_seconds:
+                        self._union(report_id, neighbour)
+                        linked = True
+                started[report_id] = not linked
+        return started
+
+    def incident_ids(self, report_ids):
+        """Incident id for each report id (the report's own id if never clustered)"""
+        with self._lock:
+            return np.array(
+                [self._find(report_id) if report_id in self._parent else report_id
+                 for report_id in np.asarray(report_ids, dtype=np.int64).tolist()],
+                dtype=np.int64,
+            )
+
+    def summarize(self, reports_df, severity_order):
+        """One row per incident, shaped like the reports frame
+
+        Each incident is its newest report's row (id, text, position, status
+        and verified all from that one report), so details looked up by id
+        match what the row shows. Only severity is aggregated, to the worst
+        of its reports; the extra incident_id and report_count columns hold
+        the incident's id and the number of merged reports.
+        """
+        if reports_df.empty:
+            return reports_df.assign(incident_id=pd.Series(dtype=np.int64), report_count=pd.Series(dtype=np.int64))
+
+        frame = reports_df.assign(
+            incident_id=self.incident_ids(reports_df['id']),
+            severity_rank=reports_df['severity'].astype(object)
+            .map({name: i for i, name in enumerate(severity_order)}).fillna(-1),
+        ).sort_values(['reported_at', 'id'], ascending=False, kind='stable')
+
+        grouped = frame.groupby('incident_id', sort=False)
+        incidents = frame.drop_duplicates('incident_id').set_index('incident_id')
+        incidents['report_count'] = grouped.size()
+        worst = grouped['severity_rank'].max().astype(int).loc[incidents.index]
+        severity_names = np.array(list(severity_order) + ['Unknown'], dtype=object)
+        incidents['severity'] = severity_names[worst.to_numpy()]
+        incidents['reporter_name'] = np.where(
+            incidents['report_count'] > 1,
+            incidents['report_count'].astype(str) + ' reports',
+            incidents['reporter_name'],
+        )
+        return (
+            incidents.drop(columns=['severity_rank'])
+            .sort_values('reported_at', ascending=False, kind='stable')
+            .reset_index()
+        )
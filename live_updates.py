@@ -0,0 +1,94 @@
+"""Change notifications that drive the live-updating parts of the page"""
+import threading
+import time
+from collections import deque
+
+from workers import DaemonWorker
+
+
+class ChangeFeed:
+    """Versioned log of recent change events shared by every session
+
+    Writers in this process call ``publish(topic, ids)`` after committing.
+    Once ``start()`` is called, a daemon thread also calls
+    ``load_changes()`` every ``poll_interval`` seconds. It must return the
+    ``(topic, ids)`` changes made since its previous call (e.g. from an
+    EventReader), which catches writes by other processes. Those are
+    published with ``external=True``, minus ids this process already
+    published itself.
+
+    Readers remember ``version()`` and later ask for ``events_since`` it.
+    """
+
+    def __init__(self, load_changes=None, poll_interval=5.0, max_events=1000):
+        self._load_changes = load_changes
+        self.poll_interval = poll_interval
+        self._events = deque(maxlen=max_events)
+        self._version = 0
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._worker = DaemonWorker(self._run, 'change-feed')
+        self._stats = {'published': 0, 'polls': 0, 'poll_errors': 0}
+
+    def publish(self, topic, ids=(), external=False):
+        """Record a change and notify listeners; returns the new version"""
+        with self._lock:
+            self._version += 1
+            event = {
+                'version': self._version, 'topic': topic, 'ids': tuple(ids),
+                'external': external, 'published_at': time.time()
+            }
+            self._events.append(event)
+            self._stats['published'] += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(event)
+        return event['version']
+
+    def subscribe(self, listener):
+        """Call listener(event) for every event published from now on"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def version(self):
+        with self._lock:
+            return self._version
+
+    def events_since(self, version, topics=None):
+        """Events after version, oldest first; None if some of them were already dropped"""
+        with self._lock:
+            if self._events and self._events[0]['version'] > version + 1:
+                return None
+            return [event for event in self._events
+                    if event['version'] > version and (topics is None or event['topic'] in topics)]
+
+    def start(self):
+        """Start the change poller (no-op without load_changes or when already running)"""
+        if self._load_changes is not None:
+            self._worker.ensure_running()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, version=self._version)
+
+    def _publish_external(self, topic, ids):
+        if ids:
+            with self._lock:
+                local_ids = {item for event in self._events
+                             if event['topic'] == topic and not event['external'] for item in event['ids']}
+            ids = [item for item in ids if item not in local_ids]
+            if not ids:
+                return
+        self.publish(topic, ids, external=True)
+
+    def _run(self):
+        while True:
+            try:
+                changes = self._load_changes()
+            except Exception:
+                changes = None
+            with self._lock:
+                self._stats['polls' if changes is not None else 'poll_errors'] += 1
+            for topic, ids in changes or ():
+                self._publish_external(topic, ids)
+            time.sleep(self.poll_interval)
@@ -0,0 +1,211 @@
+"""Bulk map layer builders for the live wildfire map"""
+import json
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.template import Template
+
+
+def escape_html(series):
+    """Column-wise HTML escaping for user-entered text"""
+    return (
+        series.astype(object).fillna('').astype(str)
+        .str.replace('&', '&amp;', regex=False)
+        .str.replace('<', '&lt;', regex=False)
+        .str.replace('>', '&gt;', regex=False)
+        .str.replace('"', '&quot;', regex=False)
+    )
+
+
+def report_popups(reports_df):
+    """Popup HTML for every report, built column-wise (with a description excerpt if the frame has one)"""
+    popups = (
+        '<b>Location:</b> ' + escape_html(reports_df['location_description'])
+        + '<br><b>Reporter:</b> ' + escape_html(reports_df['reporter_name'])
+        + '<br><b>Severity:</b> ' + escape_html(reports_df['severity'])
+        + '<br><b>Size:</b> ' + escape_html(reports_df['fire_size'])
+        + '<br><b>Status:</b> ' + escape_html(reports_df['status'])
+        + '<br><b>Reported:</b> ' + reports_df['reported_at'].astype(str)
+    )
+    if 'description' in reports_df:
+        popups += '<br><b>Description:</b> ' + escape_html(reports_df['description']).str.slice(0, 100) + '...'
+    return popups
+
+
+def report_feature_collection(reports_df, severity_colors, default_color, popups=True):
+    """GeoJSON FeatureCollection with per-report color, radius and (optionally) popup properties"""
+    colors = reports_df['severity'].astype(object).map(severity_colors).fillna(default_color)
+    radii = np.where(reports_df['severity'] == 'Critical', 15, 10)
+    popup_html = report_popups(reports_df) if popups else pd.Series([None] * len(reports_df))
+
+    features = [
+        {
+            'type': 'Feature',
+            'id': int(report_id),
+            'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+            'properties': (
+                {'color': color, 'radius': int(radius), 'popup': popup} if popups
+                else {'color': color, 'radius': int(radius)}
+            ),
+        }
+        for report_id, lat, lon, color, radius, popup in zip(
+            reports_df['id'].tolist(),
+            # Rounded so float32 coordinates don't serialize as 34.0520019531
+            reports_df['latitude'].astype(float).round(5).tolist(),
+            reports_df['longitude'].astype(float).round(5).tolist(),
+            colors.tolist(),
+            radii.tolist(),
+            popup_html.tolist(),
+        )
+    ]
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+class GeoJsonPoints(folium.MacroElement):
+    """Circle-marker layer drawn from pre-serialized GeoJSON text
+
+    Marker color and radius come from each feature's properties in the
+    browser, so the JSON text is embedded as is: rendering the map does not
+    build per-feature style dicts or re-encode the features, and the same
+    text can be served from a cache on later renders.
+    """
+
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        var {{ this.get_name() }} = L.geoJson({{ this.data }}, {
+            pointToLayer: function (feature, latlng) {
+                var properties = feature.properties;
+                return L.circleMarker(latlng, {
+                    radius: properties.radius, color: properties.color, fillColor: properties.color,
+                    fillOpacity: 0.7, weight: 2
+                });
+            },
+            onEachFeature: function (feature, layer) {
+                {%- if this.popup_field %}
+                layer.bindPopup(String(feature.properties[{{ this.popup_field|tojson }}]), {maxWidth: 300});
+                {%- endif %}
+                {%- if this.tooltip_field %}
+                layer.bindTooltip(String(feature.properties[{{ this.tooltip_field|tojson }}]));
+                {%- endif %}
+            }
+        }).addTo({{ this._parent.get_name() }});
+        {% endmacro %}
+    """)
+
+    def __init__(self, data, popup_field=None, tooltip_field=None):
+        super().__init__()
+        self._name = 'GeoJsonPoints'
+        self.data = data
+        self.popup_field = popup_field
+        self.tooltip_field = tooltip_field
+
+
+def report_layer_json(reports_df, severity_colors, default_color, popups=True):
+    """Serialized report FeatureCollection for GeoJsonPoints"""
+    return json.dumps(
+        report_feature_collection(reports_df, severity_colors, default_color, popups=popups),
+        separators=(',', ':'),
+    )
+
+
+def grid_cell_degrees(zoom, cell_px=60):
+    """Width in degrees of a cell_px-wide square at a web-map zoom level"""
+    return cell_px * 360.0 / (256 * 2 ** zoom)
+
+
+class ClusterPyramid:
+    """Grid clusters of reports for every zoom level up to max_zoom
+
+    Each level holds one row per occupied grid cell with the report count,
+    the mean position and the worst severity in the cell.
+    """
+
+    def __init__(self, reports_df, severity_order, max_zoom=10, cell_px=60):
+        self.max_zoom = max_zoom
+        self.cell_px = cell_px
+        self.severity_order = list(severity_order)
+        self.levels = {}
+        if reports_df.empty:
+            reports_df = pd.DataFrame(columns=['latitude', 'longitude', 'severity'])
+        severity_rank = {name: i for i, name in enumerate(self.severity_order)}
+        self._points = pd.DataFrame({
+            'latitude': reports_df['latitude'].astype(float).to_numpy(),
+            'longitude': reports_df['longitude'].astype(float).to_numpy(),
+            'rank': reports_df['severity'].astype(object).map(severity_rank).fillna(-1).astype(int).to_numpy(),
+        })
+
+    def _build_level(self, zoom):
+        points = self._points
+        cell = grid_cell_degrees(zoom, self.cell_px)
+        keys = [
+            np.floor(points['latitude'].to_numpy() / cell).astype(np.int64),
+            np.floor(points['longitude'].to_numpy() / cell).astype(np.int64),
+        ]
+        return points.groupby(keys, sort=False).agg(
+            count=('rank', 'size'),
+            latitude=('latitude', 'mean'),
+            longitude=('longitude', 'mean'),
+            worst_rank=('rank', 'max'),
+        ).reset_index(drop=True)
+
+    def level(self, zoom):
+        """Clusters for a zoom level, or None when individual reports should be drawn
+
+        Levels are built on first use and kept for the pyramid's lifetime.
+        """
+        if zoom is None or zoom > self.max_zoom:
+            return None
+        zoom = max(int(zoom), 0)
+        if zoom not in self.levels:
+            self.levels[zoom] = self._build_level(zoom)
+        return self.levels[zoom]
+
+    def severity_names(self, worst_rank):
+        names = np.array(self.severity_order + ['Unknown'], dtype=object)
+        return pd.Series(names[worst_rank.to_numpy()], index=worst_rank.index)
+
+
+def cluster_feature_collection(clusters, severity_names, severity_colors, default_color):
+    """GeoJSON FeatureCollection of aggregated cluster points"""
+    colors = severity_names.map(severity_colors).fillna(default_color)
+    counts = clusters['count'].to_numpy()
+    radii = np.clip(8 + 4 * np.log2(counts), 8, 30)
+    popups = (
+        '<b>' + clusters['count'].astype(str) + ' reports</b><br>'
+        + '<b>Worst severity:</b> ' + severity_names.astype(str)
+    )
+
+    features = [
+        {
+            'type': 'Feature',
+            'id': i,
+            'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+            'properties': {'color': color, 'radius': float(radius), 'count': count, 'popup': popup},
+        }
+        for i, (lat, lon, color, radius, count, popup) in enumerate(zip(
+            clusters['latitude'].tolist(),
+            clusters['longitude'].tolist(),
+            colors.tolist(),
+            radii.tolist(),
+            clusters['count'].tolist(),
+            popups.tolist(),
+        ))
+    ]
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def cluster_layer_json(pyramid, zoom, severity_colors, default_color):
+    """Serialized cluster FeatureCollection for a zoom level
+
+    Returns None when the zoom level is close enough to draw individual
+    reports.
+    """
+    clusters = pyramid.level(zoom)
+    if clusters is None:
+        return None
+    severity_names = pyramid.severity_names(clusters['worst_rank'])
+    return json.dumps(
+        cluster_feature_collection(clusters, severity_names, severity_colors, default_color),
+        separators=(',', ':'),
+    )
@@ -0,0 +1,244 @@
+"""Schema migrations for the wildfire MySQL database
+
+Run with ``python migrations.py``. Applied migrations are recorded in the
+``schema_migrations`` table so each one runs only once.
+"""
+import mysql.connector
+
+MIGRATIONS = [
+    ("0001_reports_updated_at", [
+        """
+        ALTER TABLE wildfire_reports
+        ADD COLUMN updated_at TIMESTAMP NOT NULL
+            DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        """,
+        "CREATE INDEX idx_reports_updated_at ON wildfire_reports (updated_at, id)",
+    ]),
+    ("0002_reports_lat_lon_index", [
+        # Covers the map viewport bounding-box query
+        "CREATE INDEX idx_reports_lat_lon ON wildfire_reports (latitude, longitude)",
+    ]),
+    ("0003_watch_locations", [
+        """
+        CREATE TABLE watch_locations (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            recipient_email VARCHAR(255) NOT NULL,
+            latitude DECIMAL(10, 8) NOT NULL,
+            longitude DECIMAL(11, 8) NOT NULL,
+            radius_km FLOAT NOT NULL DEFAULT 25,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_watch_recipient (recipient_email)
+        )
+        """,
+        # NULL recipient = global feed row; otherwise a personal proximity alert
+        "ALTER TABLE notifications ADD COLUMN recipient_email VARCHAR(255) NULL",
+        "CREATE INDEX idx_notifications_recipient ON notifications (recipient_email, created_at)",
+    ]),
+    ("0004_satellite_detections", [
+        """
+        CREATE TABLE satellite_detections (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            latitude DECIMAL(9, 5) NOT NULL,
+            longitude DECIMAL(10, 5) NOT NULL,
+            acquired_at DATETIME NOT NULL,
+            brightness FLOAT NULL,
+            confidence VARCHAR(8) NULL,
+            frp FLOAT NULL,
+            satellite VARCHAR(16) NULL,
+            instrument VARCHAR(16) NULL,
+            daynight CHAR(1) NULL,
+            ingested_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE KEY uq_detection (latitude, longitude, acquired_at),
+            INDEX idx_detections_acquired (acquired_at)
+        )
+        """,
+    ]),
+    ("0005_reports_pending_verification_index", [
+        # Lets the verifier read only unverified, recent reports
+        "CREATE INDEX idx_reports_verified_reported ON wildfire_reports (verified, reported_at)",
+    ]),
+    ("0006_report_rollup", [
+        # Report counts per day and (severity, status, verified), kept current
+        # by triggers so the dashboard never has to count the reports table
+        """
+        CREATE TABLE report_rollup (
+            day DATE NOT NULL,
+            severity VARCHAR(20) NOT NULL,
+            status VARCHAR(20) NOT NULL,
+            verified TINYINT NOT NULL,
+            report_count INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, severity, status, verified)
+        )
+        """,
+        """
+        CREATE TRIGGER trg_reports_rollup_insert AFTER INSERT ON wildfire_reports
+        FOR EACH ROW
+            INSERT INTO report_rollup (day, severity, status, verified, report_count)
+            VALUES (DATE(NEW.reported_at), COALESCE(NEW.severity, ''), COALESCE(NEW.status, ''),
+                    COALESCE(NEW.verified, 0), 1)
+            ON DUPLICATE KEY UPDATE report_count = report_count + 1
+        """,
+        """
+        CREATE TRIGGER trg_reports_rollup_update AFTER UPDATE ON wildfire_reports
+        FOR EACH ROW
+        BEGIN
+            IF NOT (DATE(OLD.reported_at) <=> DATE(NEW.reported_at) AND OLD.severity <=> NEW.severity
+                    AND OLD.status <=> NEW.status AND OLD.verified <=> NEW.verified) THEN
+                UPDATE report_rollup SET report_count = report_count - 1
+                WHERE day = DATE(OLD.reported_at) AND severity = COALESCE(OLD.severity, '')
+                  AND status = COALESCE(OLD.status, '') AND verified = COALESCE(OLD.verified, 0);
+                INSERT INTO report_rollup (day, severity, status, verified, report_count)
+                VALUES (DATE(NEW.reported_at), COALESCE(NEW.severity, ''), COALESCE(NEW.status, ''),
+                        COALESCE(NEW.verified, 0), 1)
+                ON DUPLICATE KEY UPDATE report_count = report_count + 1;
+            END IF;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_reports_rollup_delete AFTER DELETE ON wildfire_reports
+        FOR EACH ROW
+            UPDATE report_rollup SET report_count = report_count - 1
+            WHERE day = DATE(OLD.reported_at) AND severity = COALESCE(OLD.severity, '')
+              AND status = COALESCE(OLD.status, '') AND verified = COALESCE(OLD.verified, 0)
+        """,
+        # Backfill only once the triggers are live, so no report written in
+        # between is missed; the recount sets absolute values, overwriting any
+        # counts the triggers already added for the same reports
+        """
+        INSERT INTO report_rollup (day, severity, status, verified, report_count)
+        SELECT DATE(reported_at), COALESCE(severity, ''), COALESCE(status, ''), COALESCE(verified, 0), COUNT(*)
+        FROM wildfire_reports
+        GROUP BY DATE(reported_at), COALESCE(severity, ''), COALESCE(status, ''), COALESCE(verified, 0)
+        ON DUPLICATE KEY UPDATE report_count = VALUES(report_count)
+        """,
+    ]),
+    ("0007_reports_keyset_indexes", [
+        # Keyset pages of the report browser, unfiltered and filtered by
+        # severity or status, each read as one ordered index range
+        "CREATE INDEX idx_reports_reported_id ON wildfire_reports (reported_at, id)",
+        "CREATE INDEX idx_reports_severity_reported ON wildfire_reports (severity, reported_at, id)",
+        "CREATE INDEX idx_reports_status_reported ON wildfire_reports (status, reported_at, id)",
+    ]),
+    ("0008_report_events", [
+        # Append-only change log; rows are written in the same transaction as
+        # the report change and read back by seq (see report_events.py)
+        """
+        CREATE TABLE report_events (
+            seq BIGINT AUTO_INCREMENT PRIMARY KEY,
+            event_type VARCHAR(32) NOT NULL,
+            report_id INT NOT NULL,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+    ]),
+    ("0009_notification_inbox", [
+        # Unread inbox pages are one range of this index
+        "CREATE INDEX idx_notifications_inbox ON notifications (recipient_email, is_read, created_at, id)",
+        # Unread notifications per recipient, kept current by triggers so the
+        # badge never has to count the notifications table
+        """
+        CREATE TABLE notification_unread (
+            recipient_email VARCHAR(255) PRIMARY KEY,
+            unread_count INT NOT NULL DEFAULT 0
+        )
+        """,
+        """
+        CREATE TRIGGER trg_notifications_unread_insert AFTER INSERT ON notifications
+        FOR EACH ROW
+        BEGIN
+            IF NEW.recipient_email IS NOT NULL AND NEW.is_read = 0 THEN
+                INSERT INTO notification_unread (recipient_email, unread_count)
+                VALUES (NEW.recipient_email, 1)
+                ON DUPLICATE KEY UPDATE unread_count = unread_count + 1;
+            END IF;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_notifications_unread_update AFTER UPDATE ON notifications
+        FOR EACH ROW
+        BEGIN
+            IF NOT (OLD.recipient_email <=> NEW.recipient_email AND OLD.is_read <=> NEW.is_read) THEN
+                IF OLD.recipient_email IS NOT NULL AND OLD.is_read = 0 THEN
+                    UPDATE notification_unread SET unread_count = GREATEST(unread_count - 1, 0)
+                    WHERE recipient_email = OLD.recipient_email;
+                END IF;
+                IF NEW.recipient_email IS NOT NULL AND NEW.is_read = 0 THEN
+                    INSERT INTO notification_unread (recipient_email, unread_count)
+                    VALUES (NEW.recipient_email, 1)
+                    ON DUPLICATE KEY UPDATE unread_count = unread_count + 1;
+                END IF;
+            END IF;
+        END
+        """,
+        """
+        CREATE TRIGGER trg_notifications_unread_delete AFTER DELETE ON notifications
+        FOR EACH ROW
+        BEGIN
+            IF OLD.recipient_email IS NOT NULL AND OLD.is_read = 0 THEN
+                UPDATE notification_unread SET unread_count = GREATEST(unread_count - 1, 0)
+                WHERE recipient_email = OLD.recipient_email;
+            END IF;
+        END
+        """,
+        # Backfill once the triggers are live; the recount overwrites whatever
+        # they already added for the same notifications
+        """
+        INSERT INTO notification_unread (recipient_email, unread_count)
+        SELECT recipient_email, COUNT(*)
+        FROM notifications
+        WHERE recipient_email IS NOT NULL AND is_read = 0
+        GROUP BY recipient_email
+        ON DUPLICATE KEY UPDATE unread_count = VALUES(unread_count)
+        """,
+    ]),
+    ("0010_notifications_report_fields", [
+        # Copies of the report fields the feed shows, written with the
+        # notification so reading the feed never joins wildfire_reports
+        """
+        ALTER TABLE notifications
+        ADD COLUMN location_description TEXT NULL,
+        ADD COLUMN severity VARCHAR(20) NULL
+        """,
+        """
+        UPDATE notifications n
+        JOIN wildfire_reports w ON n.report_id = w.id
+        SET n.location_description = w.location_description, n.severity = w.severity
+        """,
+    ]),
+]
+
+
+def apply_migrations(connection):
+    """Apply every migration not yet recorded in schema_migrations"""
+    cursor = connection.cursor()
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        name VARCHAR(100) PRIMARY KEY,
+        applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cursor.execute("SELECT name FROM schema_migrations")
+    applied = {row[0] for row in cursor.fetchall()}
+
+    newly_applied = []
+    for name, statements in MIGRATIONS:
+        if name in applied:
+            continue
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.execute("INSERT INTO schema_migrations (name) VALUES (%s)", (name,))
+        connection.commit()
+        newly_applied.append(name)
+    cursor.close()
+    return newly_applied
+
+
+if __name__ == "__main__":
+    from fire import DB_CONFIG
+
+    connection = mysql.connector.connect(**DB_CONFIG)
+    try:
+        for name in apply_migrations(connection):
+            print(f"Applied {name}")
+    finally:
+        connection.close()
@@ -0,0 +1,72 @@
+"""Per-recipient notification inbox: keyset pages, bulk mark-as-read and unread counts
+
+Unread counts live in ``notification_unread`` and are kept current by
+triggers on ``notifications`` (see migrations.py), so the badge is a
+primary-key lookup instead of a COUNT over the recipient's notifications.
+"""
+from report_browser import keyset_after
+from report_writes import iter_chunks
+
+INBOX_COLUMNS = ('id', 'report_id', 'message', 'notification_type', 'created_at', 'is_read')
+
+
+def inbox_page_query(recipient, after=None, limit=20, unread_only=False, placeholder='%s'):
+    """(query, params) for up to limit of recipient's notifications after the (created_at, id) cursor
+
+    Newest first. Unread-only pages are one range of the
+    (recipient_email, is_read, created_at, id) index.
+    """
+    p = placeholder
+    conditions, params = [f"recipient_email = {p}"], [recipient]
+    if unread_only:
+        conditions.append("is_read = 0")
+    if after is not None:
+        condition, cursor_params = keyset_after(after, 'created_at', placeholder=p)
+        conditions.append(condition)
+        params.extend(cursor_params)
+    query = f"""
+    SELECT {', '.join(INBOX_COLUMNS)}
+    FROM notifications
+    WHERE {' AND '.join(conditions)}
+    ORDER BY created_at DESC, id DESC
+    LIMIT {p}
+    """
+    return query, tuple(params) + (limit,)
+
+
+def mark_read(connection, recipient, notification_ids=None, placeholder='%s', batch_size=500):
+    """Mark notification_ids (all unread ones if None) of recipient as read; returns rows changed"""
+    p = placeholder
+    cursor = connection.cursor()
+    changed = 0
+    try:
+        if notification_ids is None:
+            cursor.execute(f"UPDATE notifications SET is_read = 1 WHERE recipient_email = {p} AND is_read = 0",
+                           (recipient,))
+            changed = cursor.rowcount
+        else:
+            for batch in iter_chunks(notification_ids, batch_size):
+                cursor.execute(f"""
+                UPDATE notifications SET is_read = 1
+                WHERE recipient_email = {p} AND is_read = 0 AND id IN ({', '.join([p] * len(batch))})
+                """, (recipient, *batch))
+                changed += cursor.rowcount
+        connection.commit()
+        return changed
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def unread_count(connection, recipient, placeholder='%s'):
+    """Unread notifications of recipient, read from the trigger-maintained counter"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"SELECT unread_count FROM notification_unread WHERE recipient_email = {placeholder}",
+                       (recipient,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+    finally:
+        cursor.close()
@@ -0,0 +1,109 @@
+"""Keyset-paginated reads of wildfire reports for the report browser"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+PAGE_COLUMNS = (
+    'id', 'reporter_name', 'location_description', 'severity', 'fire_size', 'status', 'reported_at'
+)
+
+
+def keyset_after(after, time_column='reported_at', newest_first=True, placeholder='%s'):
+    """(condition, params) for rows past the (time_column, id) cursor after, in page order"""
+    # Expanded form of (time_column, id) < cursor, which MySQL can turn into an index range
+    p = placeholder
+    op = '<' if newest_first else '>'
+    return f"({time_column} {op} {p} OR ({time_column} = {p} AND id {op} {p}))", [after[0], after[0], after[1]]
+
+
+def page_query(after=None, limit=50, severity=None, status=None, date_from=None, date_to=None,
+               newest_first=True, placeholder='%s'):
+    """(query, params) for up to limit reports following the (reported_at, id) cursor ``after``
+
+    Every filter is optional; ``date_to`` is inclusive. Each page is an index
+    range scan that starts at the cursor, so its cost does not depend on how
+    many pages came before it.
+    """
+    p = placeholder
+    conditions, params = [], []
+    if severity:
+        conditions.append(f"severity = {p}")
+        params.append(severity)
+    if status:
+        conditions.append(f"status = {p}")
+        params.append(status)
+    if date_from:
+        conditions.append(f"reported_at >= {p}")
+        params.append(date_from)
+    if date_to:
+        conditions.append(f"reported_at < {p}")
+        params.append(date_to + timedelta(days=1))
+    if after is not None:
+        condition, cursor_params = keyset_after(after, 'reported_at', newest_first, p)
+        conditions.append(condition)
+        params.extend(cursor_params)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    order = 'DESC' if newest_first else 'ASC'
+    query = f"""
+    SELECT {', '.join(PAGE_COLUMNS)}
+    FROM wildfire_reports
+    {where}
+    ORDER BY reported_at {order}, id {order}
+    LIMIT {p}
+    """
+    return query, tuple(params) + (limit,)
+
+
+def next_cursor(page_df, time_column='reported_at'):
+    """Keyset cursor continuing after the last row of a page"""
+    last = page_df.iloc[-1]
+    return (last[time_column].to_pydatetime(), int(last['id']))
+
+
+class PagePrefetcher:
+    """Bounded cache of report pages loaded on a small thread pool
+
+    ``prefetch(key)`` starts loading a page in the background so that it is
+    usually ready by the time ``get(key)`` asks for it. Pages older than
+    ``ttl`` seconds are reloaded; failed loads are retried on the next call.
+    """
+
+    def __init__(self, load_page, ttl=30.0, max_entries=256, workers=2):
+        self._load_page = load_page
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-pages')
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Page for key, waiting for its load if it is still running"""
+        return self._future(key).result()
+
+    def prefetch(self, key):
+        """Start loading a page without waiting for it"""
+        self._future(key)
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _future(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                loaded_at, future = entry
+                failed = future.done() and future.exception() is not None
+                if not failed and now - loaded_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    return future
+            future = self._executor.submit(self._load_page, *key)
+            self._entries[key] = (now, future)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return future
@@ -0,0 +1,242 @@
+"""Shared, TTL-bounded report snapshots for all Streamlit sessions"""
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class SnapshotCache:
+    """Caches one loader result for ttl seconds; concurrent misses share a single load
+
+    The cached value is shared by every session, so callers must treat it as
+    read-only.
+    """
+
+    def __init__(self, loader, ttl=30.0):
+        self._loader = loader
+        self.ttl = ttl
+        self._state_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._value = None
+        self._loaded_at = None
+        self._generation = 0
+        self._stats = {'hits': 0, 'loads': 0, 'invalidations': 0}
+
+    def _fresh_value(self):
+        with self._state_lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                self._stats['hits'] += 1
+                return True, self._value
+            return False, None
+
+    def get(self):
+        """Return the cached snapshot, loading it once if it is missing or expired"""
+        fresh, value = self._fresh_value()
+        if fresh:
+            return value
+
+        with self._load_lock:
+            # Another session may have refreshed the snapshot while we waited
+            fresh, value = self._fresh_value()
+            if fresh:
+                return value
+
+            with self._state_lock:
+                generation = self._generation
+            value = self._loader()
+            with self._state_lock:
+                self._stats['loads'] += 1
+                # Don't publish a snapshot that was invalidated mid-load
+                if generation == self._generation:
+                    self._value = value
+                    self._loaded_at = time.monotonic()
+            return value
+
+    def invalidate(self):
+        """Drop the snapshot so the next get() reloads it"""
+        with self._state_lock:
+            self._generation += 1
+            self._value = None
+            self._loaded_at = None
+            self._stats['invalidations'] += 1
+
+    def stats(self):
+        with self._state_lock:
+            return dict(self._stats)
+
+
+class DeltaSync:
+    """In-process copy of wildfire_reports kept current from a high-water mark
+
+    ``fetch_rows(since_id, since_updated_at)`` must return every row whose id
+    is above ``since_id`` or whose ``updated_at`` is at or above
+    ``since_updated_at`` (all rows when both are None). Refreshes then only
+    transfer changed rows; a full reload every ``full_reload_interval``
+    seconds picks up deletes, which the app never issues itself.
+
+    ``updated_at`` is set before commit, so a slow transaction can become
+    visible after rows with later timestamps were already read. Each delta
+    therefore starts ``lag_seconds`` behind the ``updated_at`` mark; re-read
+    rows that the frame already holds unchanged are dropped before merging,
+    so a quiet refresh does not republish the snapshot.
+    """
+
+    def __init__(self, fetch_rows, full_reload_interval=3600.0, order_by='reported_at', lag_seconds=30.0):
+        self._fetch_rows = fetch_rows
+        self.full_reload_interval = full_reload_interval
+        self.order_by = order_by
+        self.lag_seconds = lag_seconds
+        self._frame = None
+        self._snapshot = None
+        self._max_id = None
+        self._max_updated_at = None
+        self._last_full_reload = None
+        self.last_delta_rows = 0
+
+    def refresh(self):
+        """Pull changes since the last refresh and return the merged snapshot"""
+        now = time.monotonic()
+        if self._frame is None or now - self._last_full_reload >= self.full_reload_interval:
+            self._frame = self._fetch_rows(None, None).set_index('id', drop=False)
+            self._last_full_reload = now
+            self.last_delta_rows = len(self._frame)
+            self._publish()
+            return self._snapshot
+
+        since_updated_at = self._max_updated_at
+        if since_updated_at is not None:
+            since_updated_at = since_updated_at - pd.Timedelta(seconds=self.lag_seconds)
+        delta = self._fetch_rows(self._max_id, since_updated_at)
+        self.last_delta_rows = len(delta)
+        if not delta.empty and self._merge(delta.set_index('id', drop=False)):
+            self._publish()
+        return self._snapshot
+
+    def _align_categories(self, delta):
+        """Give categorical columns of the frame and delta the same categories
+
+        Otherwise writing a new value into the frame fails and concat falls
+        back to object columns.
+        """
+        for column in delta.columns:
+            dtype = self._frame[column].dtype if column in self._frame else None
+            if not isinstance(dtype, pd.CategoricalDtype):
+                continue
+            missing = pd.Index(delta[column].dropna().astype(object).unique()).difference(dtype.categories)
+            if len(missing):
+                self._frame[column] = self._frame[column].cat.add_categories(missing)
+            delta[column] = delta[column].astype(object).astype(self._frame[column].dtype)
+        return delta
+
+    def _merge(self, delta):
+        """Upsert the new and changed rows of delta into the in-process frame; False if there were none"""
+        delta = self._align_categories(delta)
+        existing = delta.index.isin(self._frame.index)
+        changed = delta[existing]
+        added = delta[~existing]
+        if not changed.empty:
+            # Most re-read rows from the lag window are identical to the frame's
+            current = self._frame.loc[changed.index, changed.columns]
+            differs = (current != changed) & ~(current.isna() & changed.isna())
+            changed = changed[differs.any(axis=1)]
+            if not changed.empty:
+                self._frame.loc[changed.index, changed.columns] = changed
+        if not added.empty:
+            self._frame = pd.concat([self._frame, added])
+        return not (changed.empty and added.empty)
+
+    def _publish(self):
+        frame = self._frame
+        if frame.empty:
+            self._max_id = None
+            self._max_updated_at = None
+        else:
+            self._max_id = int(frame['id'].max())
+            self._max_updated_at = frame['updated_at'].max()
+        self._snapshot = (
+            frame.sort_values(self.order_by, ascending=False, kind='stable')
+            .reset_index(drop=True)
+        )
+
+
+class RenderCache:
+    """LRU of serialized map layers bounded by their total size in bytes
+
+    Keys should include a version of the data the layer was built from, so
+    stale entries are never served and simply age out.
+    """
+
+    def __init__(self, max_bytes=64 * 2**20):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key):
+        """Cached text for key, or None"""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return text
+
+    def put(self, key, text):
+        """Store text for key, evicting least recently used entries to stay within max_bytes"""
+        size = len(text)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = text
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._stats['evictions'] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries), bytes=self._bytes)
+
+
+class VersionedCache:
+    """Small LRU of values derived from shared data, keyed by a version of that data
+
+    ``get(key, build)`` returns the value cached for key or stores what
+    ``build()`` returns. Entries are only ever read back under their own key,
+    so sessions working on different data never see each other's values.
+    Concurrent misses for one key may build it twice; the builds run outside
+    the lock so other keys are not held up.
+    """
+
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'builds': 0}
+
+    def get(self, key, build):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return self._entries[key]
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._stats['builds'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, entries=len(self._entries))
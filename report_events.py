@@ -0,0 +1,124 @@
+"""Append-only change log of wildfire report events
+
+Writers append to ``report_events`` in the same transaction as the change
+they describe, so the log never lists an uncommitted change and never misses
+a committed one. Readers remember the last ``seq`` they processed and ask
+for the events after it instead of re-reading whole tables.
+"""
+import time
+
+from storage import PLACEHOLDERS
+
+REPORT_CREATED = 'report_created'
+REPORT_VERIFIED = 'report_verified'
+
+
+def record_events(cursor, event_type, report_ids, dialect='mysql'):
+    """Append one event per report id on the caller's cursor; the caller commits"""
+    if not report_ids:
+        return
+    p = PLACEHOLDERS[dialect]
+    cursor.executemany(
+        f"INSERT INTO report_events (event_type, report_id) VALUES ({p}, {p})",
+        [(event_type, int(report_id)) for report_id in report_ids],
+    )
+
+
+def read_events(connection, after=0, limit=500, dialect='mysql'):
+    """Up to limit events with seq above after, oldest first, as dicts"""
+    p = PLACEHOLDERS[dialect]
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f"""
+        SELECT seq, event_type, report_id, created_at
+        FROM report_events
+        WHERE seq > {p}
+        ORDER BY seq
+        LIMIT {p}
+        """, (after, limit))
+        return [
+            {'seq': seq, 'event_type': event_type, 'report_id': report_id, 'created_at': created_at}
+            for seq, event_type, report_id, created_at in cursor.fetchall()
+        ]
+    finally:
+        cursor.close()
+
+
+def seq_increment(connection, dialect='mysql'):
+    """Distance between consecutive seq values (auto_increment_increment on MySQL, 1 on SQLite)"""
+    if dialect == 'sqlite':
+        return 1
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT @@auto_increment_increment")
+        return int(cursor.fetchone()[0])
+    finally:
+        cursor.close()
+
+
+def latest_seq(connection):
+    """Sequence number of the newest event, 0 for an empty log"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("SELECT MAX(seq) FROM report_events")
+        return cursor.fetchone()[0] or 0
+    finally:
+        cursor.close()
+
+
+class EventReader:
+    """Cursor over report_events that returns new events in batches
+
+    ``borrow()`` must return a DB-API connection whose close() gives it
+    back. Without ``after`` the reader starts at the newest event.
+
+    Sequence numbers are handed out at insert time but become visible at
+    commit, so a concurrent writer can commit seq 41 after seq 42 was read.
+    A gap therefore holds the cursor back for up to ``gap_timeout`` seconds
+    before it is taken to be a rolled-back insert and skipped. Without
+    ``seq_step`` the expected distance between sequence numbers is read from
+    the database on the first ``read()``, so replicated MySQL setups with
+    auto_increment_increment > 1 are not held up at every event.
+    """
+
+    def __init__(self, borrow, dialect='mysql', after=None, batch_size=500, gap_timeout=5.0, seq_step=None):
+        self._borrow = borrow
+        self.dialect = dialect
+        self.cursor = after
+        self.batch_size = batch_size
+        self.gap_timeout = gap_timeout
+        self.seq_step = seq_step
+        self._gap = None  # (missing seq, first seen)
+
+    def read(self, max_events=10000):
+        """Events after the cursor, oldest first, advancing the cursor past them"""
+        events = []
+        connection = self._borrow()
+        try:
+            if self.seq_step is None:
+                self.seq_step = seq_increment(connection, self.dialect)
+            if self.cursor is None:
+                self.cursor = latest_seq(connection)
+            while len(events) < max_events:
+                batch = read_events(connection, self.cursor, min(self.batch_size, max_events - len(events)),
+                                    self.dialect)
+                accepted = self._accept(batch)
+                events.extend(accepted)
+                if len(accepted) < len(batch) or len(batch) < self.batch_size:
+                    break
+        finally:
+            connection.close()
+        return events
+
+    def _accept(self, batch):
+        """Leading events of batch that can be consumed without skipping an uncommitted seq"""
+        now = time.monotonic()
+        for position, event in enumerate(batch):
+            expected = self.cursor + self.seq_step
+            if event['seq'] != expected:
+                if self._gap is None or self._gap[0] != expected:
+                    self._gap = (expected, now)
+                if now - self._gap[1] < self.gap_timeout:
+                    return batch[:position]
+            self.cursor = event['seq']
+        return batch
@@ -0,0 +1,73 @@
+"""Compact in-memory representation of the shared reports snapshot
+
+``pd.read_sql`` hands back object columns for every string and 64-bit
+numbers for everything else, so a cached report costs several hundred
+bytes. ``compact_reports`` converts a fetched frame to:
+
+- Categoricals (one byte per row) for severity, status and fire_size
+- float32 coordinates (about 1 m precision)
+- a bool ``verified`` flag and datetime64 timestamps
+- Arrow-backed strings for the remaining free text
+
+``description`` is left out of the hot frame entirely; views that need it
+fetch it by id. Target: at most ``TARGET_BYTES_PER_ROW`` bytes per report,
+measured with ``memory_usage(deep=True)`` by
+benchmarks/bench_report_memory.py.
+"""
+import pandas as pd
+
+TARGET_BYTES_PER_ROW = 128
+
+SNAPSHOT_COLUMNS = (
+    'id', 'reporter_name', 'latitude', 'longitude', 'location_description',
+    'fire_size', 'severity', 'reported_at', 'status', 'verified', 'updated_at'
+)
+
+# Values the report form can produce; anything else found in the table is
+# appended to the categories rather than dropped
+KNOWN_CATEGORIES = {
+    'severity': ['Low', 'Medium', 'High', 'Critical'],
+    'status': ['Active'],
+    'fire_size': ['Small (< 1 acre)', 'Medium (1-10 acres)', 'Large (10-100 acres)', 'Massive (> 100 acres)'],
+}
+
+COLUMN_DTYPES = {
+    'id': 'int64',
+    'latitude': 'float32',
+    'longitude': 'float32',
+    'reporter_name': 'string[pyarrow]',
+    'location_description': 'string[pyarrow]',
+}
+
+
+def category_dtype(column, values):
+    """Categorical dtype holding the known values of column plus any others in values"""
+    known = KNOWN_CATEGORIES[column]
+    extra = sorted(set(values.dropna().astype(str).unique()) - set(known))
+    return pd.CategoricalDtype(known + extra)
+
+
+def compact_reports(frame):
+    """Typed, description-free copy of a fetched reports frame"""
+    frame = frame[[column for column in SNAPSHOT_COLUMNS if column in frame.columns]]
+    columns = {}
+    for column in frame.columns:
+        values = frame[column]
+        if column in KNOWN_CATEGORIES:
+            columns[column] = values.astype(category_dtype(column, values))
+        elif column in COLUMN_DTYPES:
+            columns[column] = values.astype(COLUMN_DTYPES[column])
+        elif column == 'verified':
+            columns[column] = values.fillna(0).astype(bool)
+        elif column in ('reported_at', 'updated_at'):
+            columns[column] = pd.to_datetime(values)
+        else:
+            columns[column] = values
+    return pd.DataFrame(columns, index=frame.index)
+
+
+def bytes_per_row(frame):
+    """Deep memory footprint of a frame divided by its row count"""
+    if frame.empty:
+        return 0.0
+    return frame.memory_usage(deep=True).sum() / len(frame)
@@ -0,0 +1,89 @@
+"""Batched INSERT path for wildfire reports and their notifications"""
+from itertools import islice
+
+from report_events import REPORT_CREATED, record_events
+from storage import PLACEHOLDERS
+
+REPORT_COLUMNS = (
+    'reporter_name', 'reporter_email', 'reporter_phone', 'latitude', 'longitude',
+    'location_description', 'fire_size', 'severity', 'description'
+)
+
+
+def report_notification(report_id, data):
+    """Global feed notification row for a new report, carrying the report fields the feed shows"""
+    severity_level = data[7]  # severity is at index 7
+    notification_type = 'Alert' if severity_level == 'Critical' else 'New Report'
+    notification_message = f"New wildfire reported: {data[6]} severity in {data[5]}"
+    return (report_id, notification_message, notification_type, data[5], severity_level)
+
+
+def iter_chunks(rows, chunk_size):
+    """Yield lists of at most chunk_size rows from any iterable"""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _inserted_ids(cursor, dialect, count):
+    if dialect == 'sqlite':
+        # SQLite has a single writer, so the batch occupies the rowids just
+        # below the last one inserted
+        cursor.execute("SELECT last_insert_rowid()")
+        last_id = cursor.fetchone()[0]
+        return list(range(last_id - count + 1, last_id + 1))
+
+    # executemany sends a single multi-row INSERT; InnoDB hands a simple
+    # insert all of its auto-increment values at once, so lastrowid is the
+    # first id and the rest follow at auto_increment_increment steps
+    first_id = cursor.lastrowid
+    cursor.execute("SELECT @@auto_increment_increment")
+    step = cursor.fetchone()[0]
+    return [first_id + i * step for i in range(count)]
+
+
+def insert_report_batch(connection, batch, dialect='mysql'):
+    """Insert report tuples, their notifications and change events in one transaction; returns the new ids in order"""
+    placeholder = PLACEHOLDERS[dialect]
+    cursor = connection.cursor()
+    try:
+        query = f"""
+        INSERT INTO wildfire_reports ({', '.join(REPORT_COLUMNS)})
+        VALUES ({', '.join([placeholder] * len(REPORT_COLUMNS))})
+        """
+        cursor.executemany(query, batch)
+        report_ids = _inserted_ids(cursor, dialect, len(batch))
+
+        notification_query = f"""
+        INSERT INTO notifications (report_id, message, notification_type, location_description, severity)
+        VALUES ({placeholder}, {placeholder}, {placeholder}, {placeholder}, {placeholder})
+        """
+        cursor.executemany(notification_query, [
+            report_notification(report_id, data) for report_id, data in zip(report_ids, batch)
+        ])
+        record_events(cursor, REPORT_CREATED, report_ids, dialect)
+
+        connection.commit()
+        return report_ids
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def insert_reports_bulk(connection, reports, chunk_size=1000, dialect='mysql', on_chunk=None):
+    """Insert any iterable of report tuples in chunked transactions; returns all new ids
+
+    ``on_chunk(report_ids, chunk)`` runs after each committed chunk.
+    """
+    report_ids = []
+    for chunk in iter_chunks(reports, chunk_size):
+        chunk_ids = insert_report_batch(connection, chunk, dialect)
+        report_ids.extend(chunk_ids)
+        if on_chunk is not None:
+            on_chunk(chunk_ids, chunk)
+    return report_ids
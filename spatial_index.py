@@ -0,0 +1,136 @@
+"""In-memory spatial index for nearby-report lookups"""
+import math
+import threading
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km; works element-wise on NumPy arrays"""
+    lat1, lon1, lat2, lon2 = (np.radians(value) for value in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class SpatialIndex:
+    """Fixed-size lat/lon grid of point ids answering radius and k-nearest queries
+
+    Each occupied cell stores NumPy arrays of ids and coordinates, so a query
+    only touches the cells overlapping the search circle and filters them
+    with a vectorized haversine.
+    """
+
+    def __init__(self, cell_degrees=0.5):
+        self.cell_degrees = cell_degrees
+        self._columns = int(math.ceil(360.0 / cell_degrees))
+        self._cells = {}
+        self._ids = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, point_id):
+        return point_id in self._ids
+
+    def insert(self, point_id, lat, lon):
+        """Add one point; ids already in the index are ignored"""
+        self.insert_many([point_id], [lat], [lon])
+
+    def insert_many(self, ids, lats, lons):
+        """Bulk-add points, skipping ids already in the index"""
+        ids = np.asarray(ids, dtype=np.int64)
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        with self._lock:
+            new = np.fromiter((i not in self._ids for i in ids.tolist()), dtype=bool, count=len(ids))
+            ids, lats, lons = ids[new], lats[new], lons[new]
+            if not len(ids):
+                return 0
+            rows = np.floor((lats + 90.0) / self.cell_degrees).astype(np.int64)
+            cols = np.floor((lons + 180.0) / self.cell_degrees).astype(np.int64) % self._columns
+            order = np.lexsort((cols, rows))
+            keys = np.stack([rows[order], cols[order]], axis=1)
+            starts = np.flatnonzero(np.r_[True, np.any(keys[1:] != keys[:-1], axis=1)])
+            ends = np.r_[starts[1:], len(order)]
+            for start, end in zip(starts, ends):
+                cell = (int(keys[start, 0]), int(keys[start, 1]))
+                chunk = order[start:end]
+                existing = self._cells.get(cell)
+                if existing is None:
+                    self._cells[cell] = (ids[chunk], lats[chunk], lons[chunk])
+                else:
+                    self._cells[cell] = tuple(
+                        np.concatenate([old, values[chunk]])
+                        for old, values in zip(existing, (ids, lats, lons))
+                    )
+            self._ids.update(ids.tolist())
+            return len(ids)
+
+    def _candidate_cells(self, lat, lon, radius_km):
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        min_row = int(math.floor((max(lat - dlat, -90.0) + 90.0) / self.cell_degrees))
+        max_row = int(math.floor((min(lat + dlat, 90.0) + 90.0) / self.cell_degrees))
+
+        widest_lat = min(abs(lat) + dlat, 90.0)
+        cos_lat = math.cos(math.radians(widest_lat))
+        if cos_lat < 1e-9 or radius_km / (KM_PER_DEGREE_LAT * cos_lat) >= 180.0:
+            columns = range(self._columns)
+        else:
+            dlon = radius_km / (KM_PER_DEGREE_LAT * cos_lat)
+            first = int(math.floor((lon - dlon + 180.0) / self.cell_degrees))
+            last = int(math.floor((lon + dlon + 180.0) / self.cell_degrees))
+            columns = {col % self._columns for col in range(first, last + 1)}
+
+        wanted = (max_row - min_row + 1) * len(columns)
+        if wanted > len(self._cells):
+            # Cheaper to scan occupied cells than every cell in the box
+            return [
+                cell for (row, col), cell in self._cells.items()
+                if min_row <= row <= max_row and col in columns
+            ]
+        return [
+            self._cells[(row, col)]
+            for row in range(min_row, max_row + 1)
+            for col in columns
+            if (row, col) in self._cells
+        ]
+
+    def within_radius(self, lat, lon, radius_km):
+        """(ids, distances_km) of points within radius_km, nearest first"""
+        with self._lock:
+            cells = self._candidate_cells(lat, lon, radius_km)
+        if not cells:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        ids = np.concatenate([cell[0] for cell in cells])
+        distances = haversine_km(
+            lat, lon,
+            np.concatenate([cell[1] for cell in cells]),
+            np.concatenate([cell[2] for cell in cells]),
+        )
+        inside = distances <= radius_km
+        ids, distances = ids[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return ids[order], distances[order]
+
+    def nearest(self, lat, lon, k=5):
+        """(ids, distances_km) of the k nearest points
+
+        Grows the search radius until it holds k points; a radius query is
+        exact, so the k nearest are then guaranteed to be inside it.
+        """
+        if not self._ids:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        k = min(k, len(self._ids))
+        radius_km = self.cell_degrees * KM_PER_DEGREE_LAT
+        while True:
+            ids, distances = self.within_radius(lat, lon, radius_km)
+            if len(ids) >= k or radius_km >= math.pi * EARTH_RADIUS_KM:
+                return ids[:k], distances[:k]
+            radius_km *= 2
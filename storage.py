@@ -0,0 +1,297 @@
+"""Storage backends for the wildfire app: remote MySQL or an embedded SQLite file
+
+Both expose the same small surface the app needs: ``borrow()`` returns a
+DB-API connection whose ``close()`` gives it back, ``dialect`` names the
+SQL flavour for the shared query builders and ``placeholder`` is the
+parameter marker to format into queries. The SQLite backend creates the
+full schema (indexes, rollup triggers) itself, so the app and benchmarks
+run without a database server:
+
+    WILDFIRE_STORAGE=sqlite WILDFIRE_SQLITE_PATH=wildfire_local.db streamlit run fire.py
+"""
+import sqlite3
+import threading
+from datetime import date, datetime
+
+import mysql.connector
+import pandas as pd
+
+from db_pool import ConnectionPool
+from firms_ingest import SQLITE_SCHEMA as DETECTIONS_SQLITE_SCHEMA
+
+# Catch these instead of a driver-specific error type
+STORAGE_ERRORS = (mysql.connector.Error, sqlite3.Error)
+
+# Parameter marker of each dialect, for modules that only get a dialect name
+PLACEHOLDERS = {'mysql': '%s', 'sqlite': '?'}
+
+# Mirrors the MySQL schema including migrations.py; timestamps are declared
+# TIMESTAMP so they come back as datetimes, and default to local time like
+# MySQL's CURRENT_TIMESTAMP does
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS wildfire_reports (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    reporter_name TEXT NOT NULL,
+    reporter_email TEXT,
+    reporter_phone TEXT,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    location_description TEXT,
+    fire_size TEXT,
+    severity TEXT,
+    description TEXT,
+    reported_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    status TEXT NOT NULL DEFAULT 'Active',
+    verified INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_reports_updated_at ON wildfire_reports (updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_reports_lat_lon ON wildfire_reports (latitude, longitude);
+CREATE INDEX IF NOT EXISTS idx_reports_verified_reported ON wildfire_reports (verified, reported_at);
+CREATE INDEX IF NOT EXISTS idx_reports_reported_id ON wildfire_reports (reported_at, id);
+CREATE INDEX IF NOT EXISTS idx_reports_severity_reported ON wildfire_reports (severity, reported_at, id);
+CREATE INDEX IF NOT EXISTS idx_reports_status_reported ON wildfire_reports (status, reported_at, id);
+
+CREATE TRIGGER IF NOT EXISTS trg_reports_touch AFTER UPDATE ON wildfire_reports
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE wildfire_reports SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TABLE IF NOT EXISTS notifications (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    report_id INTEGER NOT NULL REFERENCES wildfire_reports (id),
+    message TEXT NOT NULL,
+    notification_type TEXT NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    is_read INTEGER NOT NULL DEFAULT 0,
+    recipient_email TEXT,
+    location_description TEXT,
+    severity TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_notifications_recipient ON notifications (recipient_email, created_at);
+CREATE INDEX IF NOT EXISTS idx_notifications_inbox ON notifications (recipient_email, is_read, created_at, id);
+
+CREATE TABLE IF NOT EXISTS notification_unread (
+    recipient_email TEXT PRIMARY KEY,
+    unread_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_notifications_unread_insert AFTER INSERT ON notifications
+FOR EACH ROW WHEN NEW.recipient_email IS NOT NULL AND NEW.is_read = 0
+BEGIN
+    INSERT INTO notification_unread (recipient_email, unread_count) VALUES (NEW.recipient_email, 1)
+    ON CONFLICT (recipient_email) DO UPDATE SET unread_count = unread_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notifications_unread_update AFTER UPDATE ON notifications
+FOR EACH ROW WHEN NOT (OLD.recipient_email IS NEW.recipient_email AND OLD.is_read IS NEW.is_read)
+BEGIN
+    UPDATE notification_unread SET unread_count = MAX(unread_count - 1, 0)
+    WHERE recipient_email = OLD.recipient_email AND OLD.is_read = 0;
+    INSERT INTO notification_unread (recipient_email, unread_count)
+    SELECT NEW.recipient_email, 1 WHERE NEW.recipient_email IS NOT NULL AND NEW.is_read = 0
+    ON CONFLICT (recipient_email) DO UPDATE SET unread_count = unread_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notifications_unread_delete AFTER DELETE ON notifications
+FOR EACH ROW WHEN OLD.recipient_email IS NOT NULL AND OLD.is_read = 0
+BEGIN
+    UPDATE notification_unread SET unread_count = MAX(unread_count - 1, 0)
+    WHERE recipient_email = OLD.recipient_email;
+END;
+
+CREATE TABLE IF NOT EXISTS watch_locations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipient_email TEXT NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL,
+    radius_km REAL NOT NULL DEFAULT 25,
+    created_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_watch_recipient ON watch_locations (recipient_email);
+
+CREATE TABLE IF NOT EXISTS report_rollup (
+    day DATE NOT NULL,
+    severity TEXT NOT NULL,
+    status TEXT NOT NULL,
+    verified INTEGER NOT NULL,
+    report_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, severity, status, verified)
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_reports_rollup_insert AFTER INSERT ON wildfire_reports
+FOR EACH ROW
+BEGIN
+    INSERT INTO report_rollup (day, severity, status, verified, report_count)
+    VALUES (DATE(NEW.reported_at), COALESCE(NEW.severity, ''), COALESCE(NEW.status, ''),
+            COALESCE(NEW.verified, 0), 1)
+    ON CONFLICT (day, severity, status, verified) DO UPDATE SET report_count = report_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reports_rollup_update AFTER UPDATE ON wildfire_reports
+FOR EACH ROW WHEN NOT (DATE(OLD.reported_at) IS DATE(NEW.reported_at) AND OLD.severity IS NEW.severity
+                       AND OLD.status IS NEW.status AND OLD.verified IS NEW.verified)
+BEGIN
+    UPDATE report_rollup SET report_count = report_count - 1
+    WHERE day = DATE(OLD.reported_at) AND severity = COALESCE(OLD.severity, '')
+      AND status = COALESCE(OLD.status, '') AND verified = COALESCE(OLD.verified, 0);
+    INSERT INTO report_rollup (day, severity, status, verified, report_count)
+    VALUES (DATE(NEW.reported_at), COALESCE(NEW.severity, ''), COALESCE(NEW.status, ''),
+            COALESCE(NEW.verified, 0), 1)
+    ON CONFLICT (day, severity, status, verified) DO UPDATE SET report_count = report_count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_reports_rollup_delete AFTER DELETE ON wildfire_reports
+FOR EACH ROW
+BEGIN
+    UPDATE report_rollup SET report_count = report_count - 1
+    WHERE day = DATE(OLD.reported_at) AND severity = COALESCE(OLD.severity, '')
+      AND status = COALESCE(OLD.status, '') AND verified = COALESCE(OLD.verified, 0);
+END;
+
+-- AUTOINCREMENT so a seq is never reused after the newest event is deleted
+CREATE TABLE IF NOT EXISTS report_events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_type TEXT NOT NULL,
+    report_id INTEGER NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+""" + DETECTIONS_SQLITE_SCHEMA
+
+# Columns and tables added after a local database file may already have been
+# created: (table, column that marks the upgrade as applied, statements).
+# Markers are checked before SQLITE_SCHEMA runs and the statements run after
+# it, so they can fill tables the schema has just created (and whose triggers
+# already keep them current). A brand-new file needs none of them.
+SQLITE_UPGRADES = [
+    ('notifications', 'severity', [
+        "ALTER TABLE notifications ADD COLUMN location_description TEXT",
+        "ALTER TABLE notifications ADD COLUMN severity TEXT",
+        """
+        UPDATE notifications SET
+            location_description = (SELECT location_description FROM wildfire_reports w WHERE w.id = report_id),
+            severity = (SELECT severity FROM wildfire_reports w WHERE w.id = report_id)
+        """,
+    ]),
+    ('notification_unread', 'unread_count', [
+        """
+        INSERT INTO notification_unread (recipient_email, unread_count)
+        SELECT recipient_email, COUNT(*)
+        FROM notifications
+        WHERE recipient_email IS NOT NULL AND is_read = 0
+        GROUP BY recipient_email
+        ON CONFLICT (recipient_email) DO UPDATE SET unread_count = excluded.unread_count
+        """,
+    ]),
+]
+
+# Store datetimes in the same text form as datetime('now'), and read
+# TIMESTAMP / DATE columns back as Python objects
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' ', timespec='seconds'))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter('TIMESTAMP', lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+
+
+class MySQLStorage(ConnectionPool):
+    """Remote MySQL database behind the pooled connections of db_pool"""
+
+    dialect = 'mysql'
+    placeholder = PLACEHOLDERS[dialect]
+
+
+class SQLiteStorage:
+    """Embedded SQLite database file in WAL mode
+
+    Every borrow opens its own connection (cheap for a local file), so
+    threads never share one; WAL lets readers run alongside the writer and
+    ``busy_timeout`` makes concurrent writers queue instead of failing.
+    """
+
+    dialect = 'sqlite'
+    placeholder = PLACEHOLDERS[dialect]
+
+    def __init__(self, path, busy_timeout=5.0):
+        self.path = str(path)
+        self.busy_timeout = busy_timeout
+        self._lock = threading.Lock()
+        self._stats = {'borrows': 0, 'in_use': 0}
+        connection = self._connect()
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            upgrades = self._pending_upgrades(connection)
+            connection.executescript(SQLITE_SCHEMA)
+            for statements in upgrades:
+                for statement in statements:
+                    connection.execute(statement)
+                connection.commit()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _pending_upgrades(connection):
+        """Statements of the SQLITE_UPGRADES an existing database file still lacks"""
+        if not connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'wildfire_reports'").fetchone():
+            return []
+        pending = []
+        for table, column, statements in SQLITE_UPGRADES:
+            columns = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                pending.append(statements)
+        return pending
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                     detect_types=sqlite3.PARSE_DECLTYPES, factory=_BorrowedConnection)
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def borrow(self):
+        """Open a connection to the database file"""
+        connection = self._connect()
+        connection.storage = self
+        with self._lock:
+            self._stats['borrows'] += 1
+            self._stats['in_use'] += 1
+        return connection
+
+    def _release(self):
+        with self._lock:
+            self._stats['in_use'] -= 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+
+class _BorrowedConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() also updates the storage counters"""
+
+    storage = None
+
+    def close(self):
+        storage, self.storage = self.storage, None
+        super().close()
+        if storage is not None:
+            storage._release()
+
+
+def read_frame(connection, query, params=None):
+    """Rows of query on a DB-API connection as a DataFrame"""
+    cursor = connection.cursor()
+    try:
+        cursor.execute(query, params or ())
+        columns = [column[0] for column in cursor.description]
+        return pd.DataFrame(cursor.fetchall(), columns=columns)
+    finally:
+        cursor.close()
+
+
+def open_storage(config, db_config=None, pool_config=None):
+    """Build the backend named by config['backend'] ('mysql' or 'sqlite')"""
+    if config['backend'] == 'sqlite':
+        return SQLiteStorage(config['sqlite_path'])
+    if config['backend'] == 'mysql':
+        return MySQLStorage(db_config, **(pool_config or {}))
+    raise ValueError(f"Unknown storage backend: {config['backend']!r}")
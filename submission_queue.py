@@ -0,0 +1,109 @@
+"""Queued, batched write path for citizen report submissions"""
+import logging
+import queue
+import threading
+import time
+import uuid
+
+from workers import DaemonWorker
+
+logger = logging.getLogger(__name__)
+
+
+class SubmissionQueue:
+    """In-process queue whose worker writes submitted reports in batches
+
+    ``write_batch(items)`` must persist a list of report tuples in one
+    transaction and return their new ids in the same order once it has
+    committed; only its failures are retried. ``on_saved(report_ids, items)``
+    runs after a successful write, outside that retry path, so an error there
+    is logged without failing or re-inserting rows that are already saved.
+    Submitters get a token back immediately and poll ``status(token)``.
+    """
+
+    def __init__(self, write_batch, on_saved=None, max_batch=100, max_wait=0.05, status_ttl=600.0):
+        self._write_batch = write_batch
+        self._on_saved = on_saved
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.status_ttl = status_ttl
+        self._queue = queue.Queue()
+        self._statuses = {}
+        self._status_lock = threading.Lock()
+        self._worker = DaemonWorker(self._run, 'report-submissions')
+
+    def submit(self, report_data):
+        """Queue one validated report tuple and return its polling token"""
+        token = uuid.uuid4().hex
+        now = time.monotonic()
+        with self._status_lock:
+            self._prune(now)
+            self._statuses[token] = {'state': 'queued', 'report_id': None, 'error': None, 'updated': now}
+        self._worker.ensure_running()
+        self._queue.put((token, report_data))
+        return token
+
+    def status(self, token):
+        """{'state': 'queued' | 'saved' | 'failed', 'report_id', 'error'}, or None for unknown tokens"""
+        with self._status_lock:
+            status = self._statuses.get(token)
+            return dict(status) if status else None
+
+    def join(self):
+        """Block until every queued report has been written or has failed"""
+        self._queue.join()
+
+    def _prune(self, now):
+        expired = [token for token, status in self._statuses.items()
+                   if status['state'] != 'queued' and now - status['updated'] > self.status_ttl]
+        for token in expired:
+            del self._statuses[token]
+
+    def _set_status(self, token, state, report_id=None, error=None):
+        with self._status_lock:
+            self._statuses[token] = {
+                'state': state, 'report_id': report_id, 'error': error, 'updated': time.monotonic()
+            }
+
+    def _next_batch(self):
+        """Block for one submission, then gather whatever arrives within max_wait"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch):
+        try:
+            report_ids = self._write_batch([data for _, data in batch])
+        except Exception as err:
+            if len(batch) == 1:
+                self._set_status(batch[0][0], 'failed', error=str(err))
+                return
+            # Retry one by one so a single bad row can't fail the whole batch
+            for item in batch:
+                self._write([item])
+            return
+
+        for (token, _), report_id in zip(batch, report_ids):
+            self._set_status(token, 'saved', report_id=report_id)
+        if self._on_saved is not None:
+            try:
+                self._on_saved(report_ids, [data for _, data in batch])
+            except Exception:
+                logger.exception("Post-write hook failed for %d saved reports", len(report_ids))
@@ -0,0 +1,250 @@
+"""Automatic verification of citizen reports against satellite hotspots
+
+A report counts as verified when at least one FIRMS detection lies within
+``max_km`` of it and within ``max_hours`` of the time it was reported.
+FIRMS times are UTC while ``reported_at`` is written in local time (the
+MySQL session time zone, the host's zone for SQLite's ``datetime('now',
+'localtime')``), so report times are read as epoch seconds and compared in UTC.
+Run periodically (e.g. after each FIRMS ingest):
+
+    python verification.py --max-km 5 --max-hours 12
+    python verification.py --sqlite wildfire_local.db
+"""
+import argparse
+import math
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from report_events import REPORT_VERIFIED, record_events
+from spatial_index import KM_PER_DEGREE_LAT, haversine_km
+from storage import PLACEHOLDERS, read_frame
+
+TO_EPOCH = {'mysql': "UNIX_TIMESTAMP({})", 'sqlite': "CAST(strftime('%s', {}, 'utc') AS INTEGER)"}
+FROM_EPOCH = {'mysql': "FROM_UNIXTIME({})", 'sqlite': "datetime({}, 'unixepoch', 'localtime')"}
+
+
+def _utc_epoch(moment):
+    """Seconds since the epoch for a datetime; naive values are taken as UTC"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def longitude_ranges(west, east):
+    """(west, east) as one or two ranges inside [-180, 180], split where it crosses the antimeridian"""
+    if east - west >= 360.0:
+        return [(-180.0, 180.0)]
+    if west < -180.0:
+        return [(west + 360.0, 180.0), (-180.0, east)]
+    if east > 180.0:
+        return [(west, 180.0), (-180.0, east - 360.0)]
+    return [(west, east)]
+
+
+def _expand_ranges(starts, counts):
+    """Concatenate range(start, start + count) for every pair, vectorized"""
+    total = int(counts.sum())
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return np.repeat(starts, counts) + (np.arange(total) - offsets)
+
+
+def match_reports(report_lat, report_lon, report_time, det_lat, det_lon, det_time,
+                  max_km=5.0, max_hours=12.0, batch_size=50000):
+    """Boolean mask of reports with a detection within max_km and max_hours
+
+    Detections are bucketed into a (lat, lon, time) grid whose cells are
+    max_km and max_hours wide, so each report only compares against the
+    detections in its neighbouring cells instead of all of them. Times are
+    datetime64 arrays in UTC.
+    """
+    report_lat = np.asarray(report_lat, dtype=np.float64)
+    report_lon = np.asarray(report_lon, dtype=np.float64)
+    report_time = np.asarray(report_time, dtype='datetime64[s]').astype(np.int64)
+    det_lat = np.asarray(det_lat, dtype=np.float64)
+    det_lon = np.asarray(det_lon, dtype=np.float64)
+    det_time = np.asarray(det_time, dtype='datetime64[s]').astype(np.int64)
+
+    matched = np.zeros(len(report_lat), dtype=bool)
+    if not len(report_lat) or not len(det_lat):
+        return matched
+
+    cell_degrees = max(max_km / KM_PER_DEGREE_LAT, 1e-4)
+    bucket_seconds = max(int(max_hours * 3600), 1)
+    columns = int(math.ceil(360.0 / cell_degrees))
+    # Offset times so neighbouring buckets (b - 1, b + 1) never go negative
+    time_origin = min(det_time.min(), report_time.min()) - bucket_seconds
+    buckets = int((max(det_time.max(), report_time.max()) - time_origin) // bucket_seconds) + 2
+
+    def cell_key(rows, cols, time_buckets):
+        return (rows * columns + cols % columns) * buckets + time_buckets
+
+    det_keys = cell_key(
+        np.floor((det_lat + 90.0) / cell_degrees).astype(np.int64),
+        np.floor((det_lon + 180.0) / cell_degrees).astype(np.int64),
+        (det_time - time_origin) // bucket_seconds,
+    )
+    order = np.argsort(det_keys, kind='stable')
+    sorted_keys = det_keys[order]
+
+    for batch_start in range(0, len(report_lat), batch_size):
+        batch = np.arange(batch_start, min(batch_start + batch_size, len(report_lat)))
+        rows = np.floor((report_lat[batch] + 90.0) / cell_degrees).astype(np.int64)
+        cols = np.floor((report_lon[batch] + 180.0) / cell_degrees).astype(np.int64)
+        time_buckets = (report_time[batch] - time_origin) // bucket_seconds
+
+        # Longitude cells shrink towards the poles, so high-latitude reports
+        # need to look further sideways to cover max_km
+        widest = np.minimum(np.abs(report_lat[batch]) + cell_degrees, 89.99)
+        reach = np.minimum(np.ceil(1.0 / np.cos(np.radians(widest))), columns // 2).astype(np.int64)
+
+        for col_reach in np.unique(reach):
+            group = np.flatnonzero(reach == col_reach)
+            for d_row in (-1, 0, 1):
+                for d_col in range(-col_reach, col_reach + 1):
+                    for d_time in (-1, 0, 1):
+                        group = group[~matched[batch[group]]]
+                        if not len(group):
+                            break
+                        keys = cell_key(rows[group] + d_row, cols[group] + d_col, time_buckets[group] + d_time)
+                        lo = np.searchsorted(sorted_keys, keys, side='left')
+                        counts = np.searchsorted(sorted_keys, keys, side='right') - lo
+                        if not counts.any():
+                            continue
+                        candidates = order[_expand_ranges(lo, counts)]
+                        reports = batch[np.repeat(group, counts)]
+                        close = (
+                            (np.abs(det_time[candidates] - report_time[reports]) <= max_hours * 3600)
+                            & (haversine_km(report_lat[reports], report_lon[reports],
+                                            det_lat[candidates], det_lon[candidates]) <= max_km)
+                        )
+                        matched[reports[close]] = True
+    return matched
+
+
+class VerificationEngine:
+    """Incremental verifier for unverified reports inside a lookback window
+
+    Each run only reads reports with ``verified = 0`` reported within the
+    last ``lookback_hours`` (recent enough for FIRMS data to still arrive),
+    and only the detections in their time span and bounding box.
+    """
+
+    def __init__(self, connection, dialect='mysql', max_km=5.0, max_hours=12.0,
+                 lookback_hours=72.0, update_batch=1000):
+        self.connection = connection
+        self.dialect = dialect
+        self.max_km = max_km
+        self.max_hours = max_hours
+        self.lookback_hours = lookback_hours
+        self.update_batch = update_batch
+
+    def pending_reports(self, now=None):
+        """Unverified reports inside the lookback window; reported_at comes back as naive UTC"""
+        cutoff = _utc_epoch(now or datetime.now(timezone.utc)) - int(self.lookback_hours * 3600)
+        p = PLACEHOLDERS[self.dialect]
+        reports = read_frame(self.connection, f"""
+        SELECT id, latitude, longitude, {TO_EPOCH[self.dialect].format('reported_at')} AS reported_epoch
+        FROM wildfire_reports
+        WHERE verified = 0 AND reported_at >= {FROM_EPOCH[self.dialect].format(p)}
+        """, (cutoff,))
+        reports['reported_at'] = pd.to_datetime(reports.pop('reported_epoch').astype('int64'), unit='s')
+        return reports
+
+    def candidate_detections(self, reports):
+        margin_degrees = self.max_km / KM_PER_DEGREE_LAT
+        widest = min(float(reports['latitude'].abs().max()) + margin_degrees, 89.99)
+        lon_margin = margin_degrees / math.cos(math.radians(widest))
+        longitudes = longitude_ranges(float(reports['longitude'].min()) - lon_margin,
+                                      float(reports['longitude'].max()) + lon_margin)
+        window = timedelta(hours=self.max_hours)
+        p = PLACEHOLDERS[self.dialect]
+        return read_frame(self.connection, f"""
+        SELECT latitude, longitude, acquired_at
+        FROM satellite_detections
+        WHERE acquired_at BETWEEN {p} AND {p}
+          AND latitude BETWEEN {p} AND {p}
+          AND ({' OR '.join([f"longitude BETWEEN {p} AND {p}"] * len(longitudes))})
+        """, (
+            (reports['reported_at'].min() - window).strftime('%Y-%m-%d %H:%M:%S'),
+            (reports['reported_at'].max() + window).strftime('%Y-%m-%d %H:%M:%S'),
+            float(reports['latitude'].min()) - margin_degrees,
+            float(reports['latitude'].max()) + margin_degrees,
+            *(bound for longitude_range in longitudes for bound in longitude_range),
+        ))
+
+    def mark_verified(self, report_ids):
+        """Set verified = 1 in batched UPDATE ... WHERE id IN (...) statements, logging a change event per report"""
+        cursor = self.connection.cursor()
+        try:
+            for offset in range(0, len(report_ids), self.update_batch):
+                batch = report_ids[offset:offset + self.update_batch]
+                placeholders = ', '.join([PLACEHOLDERS[self.dialect]] * len(batch))
+                cursor.execute(f"UPDATE wildfire_reports SET verified = 1 WHERE id IN ({placeholders})", batch)
+            record_events(cursor, REPORT_VERIFIED, report_ids, self.dialect)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def run(self, now=None):
+        """Verify pending reports once; returns run counters"""
+        start = time.perf_counter()
+        stats = {'pending': 0, 'detections': 0, 'verified': 0, 'seconds': 0.0}
+        reports = self.pending_reports(now)
+        stats['pending'] = len(reports)
+        if not reports.empty:
+            reports['latitude'] = reports['latitude'].astype(float)
+            reports['longitude'] = reports['longitude'].astype(float)
+            detections = self.candidate_detections(reports)
+            stats['detections'] = len(detections)
+            if not detections.empty:
+                matched = match_reports(
+                    reports['latitude'], reports['longitude'], reports['reported_at'].to_numpy(),
+                    detections['latitude'].astype(float), detections['longitude'].astype(float),
+                    pd.to_datetime(detections['acquired_at']).to_numpy(),
+                    max_km=self.max_km, max_hours=self.max_hours,
+                )
+                verified_ids = [int(report_id) for report_id in reports['id'][matched]]
+                self.mark_verified(verified_ids)
+                stats['verified'] = len(verified_ids)
+        stats['seconds'] = time.perf_counter() - start
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify citizen reports against satellite detections")
+    parser.add_argument('--max-km', type=float, default=5.0, help="Largest report-to-hotspot distance")
+    parser.add_argument('--max-hours', type=float, default=12.0, help="Largest report-to-hotspot time gap")
+    parser.add_argument('--lookback-hours', type=float, default=72.0, help="Age of the oldest report to check")
+    parser.add_argument('--sqlite', metavar='PATH', help="Use a local SQLite file instead of MySQL")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        import sqlite3
+
+        connection = sqlite3.connect(args.sqlite)
+        dialect = 'sqlite'
+    else:
+        import mysql.connector
+        from fire import DB_CONFIG
+
+        connection = mysql.connector.connect(**DB_CONFIG)
+        dialect = 'mysql'
+
+    try:
+        engine = VerificationEngine(connection, dialect, max_km=args.max_km, max_hours=args.max_hours,
+                                    lookback_hours=args.lookback_hours)
+        stats = engine.run()
+        print(f"Checked {stats['pending']:,} pending reports against {stats['detections']:,} detections: "
+              f"{stats['verified']:,} verified in {stats['seconds']:.2f} s")
+    finally:
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
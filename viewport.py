@@ -0,0 +1,66 @@
+"""Map viewport helpers for bounding-box report queries"""
+import math
+
+
+def bounds_from_map_state(map_state):
+    """(south, west, north, east) from an st_folium return value, or None"""
+    bounds = (map_state or {}).get('bounds') or {}
+    south_west = bounds.get('_southWest') or {}
+    north_east = bounds.get('_northEast') or {}
+    values = (south_west.get('lat'), south_west.get('lng'), north_east.get('lat'), north_east.get('lng'))
+    if any(value is None for value in values):
+        return None
+    return values
+
+
+def _snap(value, step, direction):
+    return direction(value / step) * step
+
+
+def padded_bounds(bounds, margin=0.25):
+    """Grow the bounds by a fraction of their size and snap them outward to a grid
+
+    Snapping means small pans reuse the same (cached) query instead of
+    issuing a new one for every pixel moved.
+    """
+    south, west, north, east = bounds
+    lat_pad = (north - south) * margin
+    lon_pad = (east - west) * margin
+    # Grid step is a power of two fraction of the padded span
+    step = 2.0 ** math.floor(math.log2(max(north - south + 2 * lat_pad, east - west + 2 * lon_pad, 1e-6) / 4))
+
+    south = max(_snap(south - lat_pad, step, math.floor), -90.0)
+    north = min(_snap(north + lat_pad, step, math.ceil), 90.0)
+    west = _snap(west - lon_pad, step, math.floor)
+    east = _snap(east + lon_pad, step, math.ceil)
+    return south, west, north, east
+
+
+def _wrap_west(longitude):
+    """Wrap into [-180, 180)"""
+    return (longitude + 180.0) % 360.0 - 180.0
+
+
+def _wrap_east(longitude):
+    """Wrap into (-180, 180]"""
+    return 180.0 - (180.0 - longitude) % 360.0
+
+
+def bounds_filter(bounds, placeholder='%s'):
+    """SQL WHERE clause and params selecting reports inside the bounds
+
+    Handles views that span the antimeridian or the whole world.
+    """
+    p = placeholder
+    south, west, north, east = bounds
+    clause = f"latitude BETWEEN {p} AND {p}"
+    params = [south, north]
+    if east - west < 360.0:
+        west, east = _wrap_west(west), _wrap_east(east)
+        if west <= east:
+            clause += f" AND longitude BETWEEN {p} AND {p}"
+            params += [west, east]
+        else:
+            clause += f" AND (longitude >= {p} OR longitude <= {p})"
+            params += [west, east]
+    return clause, tuple(params)
@@ -0,0 +1,22 @@
+"""Background worker threads shared by the queues and pollers of the app"""
+import threading
+
+
+class DaemonWorker:
+    """Daemon thread running ``target()``, started on first use
+
+    ``ensure_running()`` is safe to call from any thread and on every
+    submit: it starts the thread once and restarts it if it has died.
+    """
+
+    def __init__(self, target, name):
+        self._target = target
+        self.name = name
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def ensure_running(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._target, name=self.name, daemon=True)
+                self._thread.start()